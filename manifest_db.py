@@ -7,16 +7,90 @@ for faster access, reduced API calls, and offline capabilities.
 """
 import os
 import asyncio
+import functools
+import hashlib
 import sqlite3
 import json
 import logging
-import time
-from typing import Dict, Any, Optional, List, Tuple, Union
+from typing import Callable, Dict, Any, Iterable, Optional, List, Tuple, Union
 from pathlib import Path
+from itertools import islice
+from contextlib import contextmanager
 import argparse
+import queue
+
+# orjson serializes/deserializes several times faster than stdlib json, which
+# matters when we dump tens of thousands of manifest entries per component.
+# Fall back to stdlib json if it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    _dumps = lambda obj: json.dumps(obj).encode()
+    _loads = json.loads
+
+# msgpack encodes the mostly-numeric definition dicts roughly half the size
+# of JSON and unpacks faster for small payloads, so prefer it as the inner
+# payload encoding when installed. JSON bytes are used otherwise.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+if msgpack:
+    def _encode(obj: Any) -> bytes:
+        """Serialize an object to msgpack bytes."""
+        return msgpack.packb(obj, use_bin_type=True)
+else:
+    _encode = _dumps
+
+# The encoded payload is highly compressible, so compress the stored blobs
+# with zstd when available to shrink the database and the page-cache
+# footprint. Uncompressed payloads are stored if zstandard isn't installed.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+if zstandard:
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def _pack(obj: Any) -> bytes:
+        """Serialize an object to a compressed payload blob."""
+        return _zstd_compressor.compress(_encode(obj))
+else:
+    _pack = _encode
+
+def _unpack(data: bytes) -> Any:
+    """
+    Deserialize a stored payload blob, decompressing if it is zstd-framed.
+    The inner encoding is sniffed so databases written with either JSON or
+    msgpack payloads keep decoding correctly.
+    """
+    if isinstance(data, bytes) and data[:4] == ZSTD_MAGIC:
+        if not zstandard:
+            raise RuntimeError(
+                "Database contains zstd-compressed blobs but zstandard is not installed"
+            )
+        data = _zstd_decompressor.decompress(data)
+    if isinstance(data, str) or data[:1] in (b"{", b"["):
+        return _loads(data)
+    if not msgpack:
+        raise RuntimeError(
+            "Database contains msgpack blobs but msgpack is not installed"
+        )
+    return msgpack.unpackb(data, raw=False)
 
 # Import our manifest component retrieval function
-from manifest_helper import get_manifest_component
+from manifest_helper import get_manifest_component, close_session
 
 # Set up logging
 logging.basicConfig(
@@ -25,6 +99,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared default for absent nested objects - resolving to one module-level
+# dict keeps the per-item extraction to a single .get() per nested path
+# instead of allocating a fresh {} default on every lookup
+_EMPTY: Dict[str, Any] = {}
+
 # Constants
 DB_FILENAME = "destiny_manifest.db"
 COMPONENTS_TO_FETCH = [
@@ -34,14 +113,173 @@ COMPONENTS_TO_FETCH = [
     "DestinyDamageTypeDefinition"
 ]
 
+# Pool of read-only connections for the query helpers. WAL mode supports
+# concurrent readers, so pooled connections let callers (or a thread pool)
+# run queries in parallel without reopening the database each time.
+_READ_POOL_SIZE = 4
+_read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=_READ_POOL_SIZE)
+
+@contextmanager
+def _read_connection():
+    """Borrow a read-only connection from the pool, creating one on demand."""
+    try:
+        conn = _read_pool.get_nowait()
+    except queue.Empty:
+        conn = sqlite3.connect(DB_FILENAME, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=1")
+    try:
+        yield conn
+    finally:
+        try:
+            _read_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+# Upsert statements hoisted to module scope - sqlite3 caches prepared
+# statements keyed on the SQL text, so passing the same string object on
+# every run guarantees a cache hit and skips re-parsing the statement
+_UPSERT_ITEM_SQL = '''INSERT INTO inventory_items
+           (hash, json_data, name, description, icon, item_type, tier_type,
+            class_type, damage_type, equippable, bucket_hash)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(hash) DO UPDATE SET
+               json_data=excluded.json_data, name=excluded.name,
+               description=excluded.description, icon=excluded.icon,
+               item_type=excluded.item_type, tier_type=excluded.tier_type,
+               class_type=excluded.class_type, damage_type=excluded.damage_type,
+               equippable=excluded.equippable, bucket_hash=excluded.bucket_hash'''
+
+_UPSERT_ACTIVITY_SQL = '''INSERT INTO activities
+           (hash, json_data, name, description,
+            activity_type_hash, destination_hash, place_hash,
+            activity_mode_hash, is_playlist)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(hash) DO UPDATE SET
+               json_data=excluded.json_data, name=excluded.name,
+               description=excluded.description,
+               activity_type_hash=excluded.activity_type_hash,
+               destination_hash=excluded.destination_hash,
+               place_hash=excluded.place_hash,
+               activity_mode_hash=excluded.activity_mode_hash,
+               is_playlist=excluded.is_playlist'''
+
+# The two small tables use multi-row VALUES inserts built from a prefix and
+# conflict suffix, which skips the per-row executemany binding bridge
+_UPSERT_CLASS_PREFIX = "INSERT INTO classes (hash, json_data, name, class_type) VALUES "
+_UPSERT_CLASS_SUFFIX = ''' ON CONFLICT(hash) DO UPDATE SET
+               json_data=excluded.json_data, name=excluded.name,
+               class_type=excluded.class_type'''
+
+_UPSERT_DAMAGE_TYPE_PREFIX = '''INSERT INTO damage_types
+           (hash, json_data, name, description, icon, enum_value) VALUES '''
+_UPSERT_DAMAGE_TYPE_SUFFIX = ''' ON CONFLICT(hash) DO UPDATE SET
+               json_data=excluded.json_data, name=excluded.name,
+               description=excluded.description, icon=excluded.icon,
+               enum_value=excluded.enum_value'''
+
+def _executemany_chunked(
+    cursor: sqlite3.Cursor,
+    sql: str,
+    rows: Iterable[Tuple],
+    chunk_size: int = 10000
+) -> None:
+    """
+    Feed rows to executemany in bounded chunks so a 40k-row component
+    doesn't turn into one monolithic binding loop. ~10k rows per batch is
+    the sweet spot for SQLite; larger batches gain little.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        cursor.executemany(sql, chunk)
+
+def _execute_multirow(
+    cursor: sqlite3.Cursor,
+    prefix: str,
+    suffix: str,
+    rows: Iterable[Tuple],
+    row_width: int,
+    batch_size: int = 500
+) -> None:
+    """
+    Insert rows via multi-row VALUES statements. For small tables this beats
+    executemany because each batch is a single statement execution instead of
+    one Python-to-SQLite bridge crossing per row.
+    """
+    placeholder = "(" + ",".join("?" * row_width) + ")"
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        sql = prefix + ",".join([placeholder] * len(batch)) + suffix
+        cursor.execute(sql, [value for row in batch for value in row])
+
+def _content_version(component_data: Dict[str, Any]) -> str:
+    """
+    Compute a stable content hash for a fetched component, used as its
+    stored version so unchanged components skip the DB write entirely.
+    The hash is always taken over a canonical key-sorted serialization of
+    the parsed dict - the fetcher's raw bytes are representation-dependent
+    (raw JSON from the network, msgpack from the disk cache), so hashing
+    them made identical content look changed whenever the cache state
+    differed between runs.
+    """
+    if orjson:
+        payload = orjson.dumps(component_data, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(component_data, sort_keys=True).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+# Covering indexes for the inventory item query hot paths, keyed by name so
+# they can be dropped before a bulk load and recreated afterwards
+_ITEM_INDEXES = {
+    "idx_items_type": "inventory_items(item_type, name)",
+    "idx_items_tier_type": "inventory_items(tier_type, item_type)",
+    "idx_items_damage": "inventory_items(damage_type)",
+    "idx_items_class": "inventory_items(class_type, equippable)",
+    "idx_wv_damage": "weapons_view(damage_type)",
+    "idx_wv_tier": "weapons_view(tier_type)",
+}
+
+def drop_indexes(conn: sqlite3.Connection) -> None:
+    """Drop the inventory item indexes ahead of a bulk load."""
+    for index_name in _ITEM_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+def rebuild_indexes(conn: sqlite3.Connection) -> None:
+    """Recreate the inventory item indexes and refresh planner statistics."""
+    for index_name, index_spec in _ITEM_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {index_spec}")
+    conn.execute("ANALYZE")
+
 def create_database() -> sqlite3.Connection:
     """
     Create and initialize the SQLite database for storing manifest data.
     Returns a connection to the database.
     """
     logger.info(f"Creating/connecting to database: {DB_FILENAME}")
-    conn = sqlite3.connect(DB_FILENAME)
-    
+    # isolation_level=None gives us manual transaction control so each
+    # component ingest can run inside a single explicit transaction
+    conn = sqlite3.connect(DB_FILENAME, isolation_level=None)
+    # Rows come back as sqlite3.Row so query helpers can convert them to
+    # dicts directly instead of zipping columns by hand
+    conn.row_factory = sqlite3.Row
+
+    # Tune SQLite for bulk ingest: WAL avoids a full fsync per commit,
+    # synchronous=NORMAL is safe in WAL mode, and a bigger cache plus
+    # memory temp store keeps the write path off disk as much as possible.
+    # page_size only takes effect on a freshly created database.
+    conn.execute("PRAGMA page_size=8192")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=10737418240")
+
     # Create component manifest version tracking table
     conn.execute('''
     CREATE TABLE IF NOT EXISTS manifest_versions (
@@ -55,7 +293,7 @@ def create_database() -> sqlite3.Connection:
     conn.execute('''
     CREATE TABLE IF NOT EXISTS inventory_items (
         hash INTEGER PRIMARY KEY,
-        json_data TEXT NOT NULL,
+        json_data BLOB NOT NULL,
         name TEXT,
         description TEXT,
         icon TEXT,
@@ -72,7 +310,7 @@ def create_database() -> sqlite3.Connection:
     conn.execute('''
     CREATE TABLE IF NOT EXISTS activities (
         hash INTEGER PRIMARY KEY,
-        json_data TEXT NOT NULL,
+        json_data BLOB NOT NULL,
         name TEXT,
         description TEXT,
         activity_type_hash INTEGER,
@@ -87,7 +325,7 @@ def create_database() -> sqlite3.Connection:
     conn.execute('''
     CREATE TABLE IF NOT EXISTS classes (
         hash INTEGER PRIMARY KEY,
-        json_data TEXT NOT NULL,
+        json_data BLOB NOT NULL,
         name TEXT,
         class_type INTEGER
     )
@@ -97,378 +335,433 @@ def create_database() -> sqlite3.Connection:
     conn.execute('''
     CREATE TABLE IF NOT EXISTS damage_types (
         hash INTEGER PRIMARY KEY,
-        json_data TEXT NOT NULL,
+        json_data BLOB NOT NULL,
         name TEXT,
         description TEXT,
         icon TEXT,
         enum_value INTEGER
     )
     ''')
-    
+
+    # Materialized weapons view - precomputes the inventory/damage_types
+    # JOIN plus the LIKE '%Weapon%' filter that defeats the item_type index,
+    # refreshed at the end of every update
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS weapons_view (
+        hash INTEGER PRIMARY KEY,
+        name TEXT,
+        item_type TEXT,
+        tier_type TEXT,
+        damage_type INTEGER,
+        damage_name TEXT
+    )
+    ''')
+
+    # Covering indexes for the query hot paths - without these every
+    # filtered query walks all ~40k inventory item rows
+    rebuild_indexes(conn)
+
+    # Full-text index for name search - LIKE '%x%' can't use a B-tree index
+    # and scans the whole table. Triggers keep the FTS table in sync with
+    # the upserts done by store_inventory_items.
+    try:
+        fts_existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+        ).fetchone() is not None
+        conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+            name, description, content='inventory_items', content_rowid='hash'
+        )
+        ''')
+        conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON inventory_items BEGIN
+            INSERT INTO items_fts(rowid, name, description)
+            VALUES (new.hash, new.name, new.description);
+        END
+        ''')
+        conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON inventory_items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, name, description)
+            VALUES ('delete', old.hash, old.name, old.description);
+        END
+        ''')
+        conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE ON inventory_items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, name, description)
+            VALUES ('delete', old.hash, old.name, old.description);
+            INSERT INTO items_fts(rowid, name, description)
+            VALUES (new.hash, new.name, new.description);
+        END
+        ''')
+        if not fts_existed:
+            # A freshly created external-content index starts empty even
+            # when inventory_items already has rows - searches would come
+            # back empty and the update trigger's 'delete' commands would
+            # corrupt the index. Rebuild syncs it with existing content
+            # (a no-op on a brand-new database).
+            conn.execute("INSERT INTO items_fts(items_fts) VALUES('rebuild')")
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5 - name search falls back to LIKE scans
+        logger.warning(f"FTS5 unavailable, name search will use LIKE scans: {e}")
+
     conn.commit()
     return conn
 
-async def fetch_and_store_component(
+def refresh_weapons_view(conn: sqlite3.Connection) -> None:
+    """Rebuild the materialized weapons view from the base tables."""
+    conn.execute("DELETE FROM weapons_view")
+    conn.execute('''
+    INSERT INTO weapons_view (hash, name, item_type, tier_type, damage_type, damage_name)
+    SELECT i.hash, i.name, i.item_type, i.tier_type, i.damage_type, d.name
+    FROM inventory_items i
+    JOIN damage_types d ON i.damage_type = d.enum_value
+    WHERE i.item_type LIKE '%Weapon%'
+    ''')
+
+async def fetch_component(component_type: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a specific manifest component from the Bungie API.
+
+    Args:
+        component_type: The manifest component to fetch
+
+    Returns:
+        The success dict from get_manifest_component, or None if the
+        fetch failed
+    """
+    logger.info(f"Fetching component: {component_type}")
+
+    result = await get_manifest_component(component_type)
+
+    if result.get("status") != "success":
+        logger.error(f"Failed to retrieve {component_type}: {result.get('error')}")
+        return None
+
+    if not result.get("componentData"):
+        logger.warning(f"No data found for {component_type}")
+        return None
+
+    return result
+
+def store_component(
     conn: sqlite3.Connection,
     component_type: str,
-    force_update: bool = False
+    component_data: Dict[str, Any],
+    force_update: bool = False,
+    before_store: Optional[Callable[[], None]] = None
 ) -> bool:
     """
-    Fetch a specific manifest component and store it in the database.
-    
+    Store a fetched manifest component in the database.
+
     Args:
         conn: SQLite database connection
-        component_type: The manifest component to fetch
+        component_type: The manifest component being stored
+        component_data: The component data returned by fetch_component
         force_update: If True, update even if version hasn't changed
-        
+        before_store: Called once the version check has decided a store
+            will proceed, before any table is touched - lets the caller
+            defer bulk-load preparation (index drops) past the
+            up-to-date fast path
+
     Returns:
         True if the database was updated, False otherwise
     """
-    logger.info(f"Processing component: {component_type}")
-    
-    # Step 1: Fetch the manifest component
-    result = await get_manifest_component(component_type)
-    
-    if result.get("status") != "success":
-        logger.error(f"Failed to retrieve {component_type}: {result.get('error')}")
-        return False
-    
-    component_data = result.get("componentData", {})
-    if not component_data:
-        logger.warning(f"No data found for {component_type}")
-        return False
-    
-    # Step 2: Store in database based on component type
     cursor = conn.cursor()
     
-    # Check if we need to update based on manifest version
-    # In a real implementation, we'd compare versions here
-    # For now, we'll use the item count as a proxy for the version
+    # Check if we need to update based on a hash of the fetched content -
+    # an unchanged component short-circuits before any table is touched
     cursor.execute("SELECT * FROM manifest_versions WHERE component_type = ?", (component_type,))
     version_record = cursor.fetchone()
-    
-    # Generate a simple version identifier based on data size
-    current_version = f"{len(component_data)}-{int(time.time())}"
-    
+
+    current_version = _content_version(component_data)
+
     if version_record and not force_update:
         stored_version = version_record[1]
-        # In a real implementation, compare actual version strings
-        if stored_version.split('-')[0] == current_version.split('-')[0]:
+        if stored_version == current_version:
             logger.info(f"{component_type} is already up to date (version: {stored_version})")
             return False
     
-    # Step 3: Process and store the data
-    if component_type == "DestinyInventoryItemDefinition":
-        store_inventory_items(conn, component_data)
-    elif component_type == "DestinyActivityDefinition":
-        store_activities(conn, component_data)
-    elif component_type == "DestinyClassDefinition":
-        store_classes(conn, component_data)
-    elif component_type == "DestinyDamageTypeDefinition":
-        store_damage_types(conn, component_data)
-    else:
-        logger.warning(f"No specific storage handler for {component_type}, skipping")
-        return False
-    
-    # Update the version record
-    if version_record:
-        cursor.execute(
-            "UPDATE manifest_versions SET version = ?, last_updated = CURRENT_TIMESTAMP WHERE component_type = ?",
-            (current_version, component_type)
-        )
-    else:
-        cursor.execute(
-            "INSERT INTO manifest_versions (component_type, version) VALUES (?, ?)",
-            (component_type, current_version)
-        )
-    
-    conn.commit()
+    if before_store:
+        before_store()
+
+    # Step 3: Process and store the data inside a single transaction so the
+    # whole component ingest costs one fsync instead of one per statement
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if component_type == "DestinyInventoryItemDefinition":
+            store_inventory_items(cursor, component_data)
+        elif component_type == "DestinyActivityDefinition":
+            store_activities(cursor, component_data)
+        elif component_type == "DestinyClassDefinition":
+            store_classes(cursor, component_data)
+        elif component_type == "DestinyDamageTypeDefinition":
+            store_damage_types(cursor, component_data)
+        else:
+            logger.warning(f"No specific storage handler for {component_type}, skipping")
+            conn.rollback()
+            return False
+
+        # Update the version record
+        if version_record:
+            cursor.execute(
+                "UPDATE manifest_versions SET version = ?, last_updated = CURRENT_TIMESTAMP WHERE component_type = ?",
+                (current_version, component_type)
+            )
+        else:
+            cursor.execute(
+                "INSERT INTO manifest_versions (component_type, version) VALUES (?, ?)",
+                (component_type, current_version)
+            )
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    # Checkpoint between components so the WAL doesn't accumulate all four
+    # ingests before being folded back into the main database file
+    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    # Stored rows may have changed, so cached item lookups are stale
+    get_item_by_hash.cache_clear()
+
     logger.info(f"Updated {component_type} in database (version: {current_version})")
     return True
 
-def store_inventory_items(conn: sqlite3.Connection, items_data: Dict[str, Any]) -> None:
+def store_inventory_items(cursor: sqlite3.Cursor, items_data: Dict[str, Any]) -> None:
     """Store inventory item definitions in the database."""
-    cursor = conn.cursor()
-    
-    # Delete existing data - in a more sophisticated implementation, you might do an incremental update
-    cursor.execute("DELETE FROM inventory_items")
-    
-    # Process and insert items
-    items = []
-    for hash_str, item in items_data.items():
-        # Convert string hash to integer
-        item_hash = int(hash_str)
-        
-        # Extract fields we want to query directly
-        display_props = item.get("displayProperties", {})
-        name = display_props.get("name", "")
-        description = display_props.get("description", "")
-        icon = display_props.get("icon", "")
-        
-        # Other useful fields
-        item_type = item.get("itemTypeDisplayName", "")
-        tier_type = item.get("inventory", {}).get("tierTypeName", "")
-        class_type = item.get("classType", -1)
-        damage_type = item.get("defaultDamageType", 0)
-        equippable = item.get("equippable", False)
-        bucket_hash = item.get("inventory", {}).get("bucketTypeHash", 0)
-        
-        # Store the full JSON for complete data access
-        json_data = json.dumps(item)
-        
-        items.append((
-            item_hash, json_data, name, description, icon, 
-            item_type, tier_type, class_type, damage_type, 
-            equippable, bucket_hash
-        ))
-    
-    # Batch insert for improved performance
-    cursor.executemany(
-        '''INSERT INTO inventory_items 
-           (hash, json_data, name, description, icon, item_type, tier_type, 
-            class_type, damage_type, equippable, bucket_hash) 
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', 
-        items
-    )
-    
-    conn.commit()
-    logger.info(f"Stored {len(items)} inventory items in database")
+    # Yield rows lazily so executemany consumes them one at a time instead
+    # of us materializing ~40k tuples alongside the source dict
+    def _rows():
+        # Local bindings: LOAD_FAST is cheaper than LOAD_GLOBAL, which adds
+        # up over ~40k iterations of this loop
+        pack = _pack
+        empty = _EMPTY
+
+        for hash_str, item in items_data.items():
+            # Bind the bound method once, then extract the nested objects
+            # we pull several fields from
+            get = item.get
+            display_props = get("displayProperties") or empty
+            inventory = get("inventory") or empty
+
+            yield (
+                int(hash_str),
+                pack(item),  # Store the full JSON for complete data access
+                display_props.get("name", ""),
+                display_props.get("description", ""),
+                display_props.get("icon", ""),
+                get("itemTypeDisplayName", ""),
+                inventory.get("tierTypeName", ""),
+                get("classType", -1),
+                get("defaultDamageType", 0),
+                get("equippable", False),
+                inventory.get("bucketTypeHash", 0)
+            )
+
+    # Upsert so only changed rows are rewritten, rather than invalidating
+    # the whole table (and all of its index pages) on every update.
+    # Note: a pandas DataFrame.to_sql bulk load was evaluated here, but
+    # to_sql can't express ON CONFLICT upserts or run inside our explicit
+    # transaction, and the insert loop already executes in C via
+    # executemany - the remaining per-row cost is the zstd/orjson packing,
+    # which pandas wouldn't vectorize either.
+    _executemany_chunked(cursor, _UPSERT_ITEM_SQL, _rows())
 
-def store_activities(conn: sqlite3.Connection, activities_data: Dict[str, Any]) -> None:
+    logger.info(f"Stored {len(items_data)} inventory items in database")
+
+def store_activities(cursor: sqlite3.Cursor, activities_data: Dict[str, Any]) -> None:
     """Store activity definitions in the database."""
-    cursor = conn.cursor()
-    
-    # Delete existing data
-    cursor.execute("DELETE FROM activities")
-    
-    # Process and insert activities
-    activities = []
-    for hash_str, activity in activities_data.items():
-        # Convert string hash to integer
-        activity_hash = int(hash_str)
-        
-        # Extract fields
-        display_props = activity.get("displayProperties", {})
-        name = display_props.get("name", "")
-        description = display_props.get("description", "")
-        
-        # Other useful fields
-        activity_type_hash = activity.get("activityTypeHash", 0)
-        destination_hash = activity.get("destinationHash", 0)
-        place_hash = activity.get("placeHash", 0)
-        activity_mode_hash = activity.get("activityModeHash", 0)
-        is_playlist = activity.get("isPlaylist", False)
-        
-        # Store the full JSON
-        json_data = json.dumps(activity)
-        
-        activities.append((
-            activity_hash, json_data, name, description,
-            activity_type_hash, destination_hash, place_hash,
-            activity_mode_hash, is_playlist
-        ))
-    
-    # Batch insert
-    cursor.executemany(
-        '''INSERT INTO activities 
-           (hash, json_data, name, description, 
-            activity_type_hash, destination_hash, place_hash,
-            activity_mode_hash, is_playlist) 
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''', 
-        activities
-    )
-    
-    conn.commit()
-    logger.info(f"Stored {len(activities)} activities in database")
+    # Yield rows lazily instead of materializing the full tuple list
+    def _rows():
+        for hash_str, activity in activities_data.items():
+            display_props = activity.get("displayProperties") or _EMPTY
+
+            yield (
+                int(hash_str),
+                _pack(activity),  # Store the full JSON
+                display_props.get("name", ""),
+                display_props.get("description", ""),
+                activity.get("activityTypeHash", 0),
+                activity.get("destinationHash", 0),
+                activity.get("placeHash", 0),
+                activity.get("activityModeHash", 0),
+                activity.get("isPlaylist", False)
+            )
+
+    # Upsert so only changed rows are rewritten
+    _executemany_chunked(cursor, _UPSERT_ACTIVITY_SQL, _rows())
 
-def store_classes(conn: sqlite3.Connection, classes_data: Dict[str, Any]) -> None:
+    logger.info(f"Stored {len(activities_data)} activities in database")
+
+def store_classes(cursor: sqlite3.Cursor, classes_data: Dict[str, Any]) -> None:
     """Store class definitions in the database."""
-    cursor = conn.cursor()
-    
-    # Delete existing data
-    cursor.execute("DELETE FROM classes")
-    
-    # Process and insert classes
-    classes = []
-    for hash_str, class_def in classes_data.items():
-        # Convert string hash to integer
-        class_hash = int(hash_str)
-        
-        # Extract fields
-        display_props = class_def.get("displayProperties", {})
-        name = display_props.get("name", "")
-        class_type = class_def.get("classType", -1)
-        
-        # Store the full JSON
-        json_data = json.dumps(class_def)
-        
-        classes.append((class_hash, json_data, name, class_type))
-    
-    # Batch insert
-    cursor.executemany(
-        "INSERT INTO classes (hash, json_data, name, class_type) VALUES (?, ?, ?, ?)", 
-        classes
-    )
-    
-    conn.commit()
-    logger.info(f"Stored {len(classes)} classes in database")
+    # Yield rows lazily instead of materializing the full tuple list
+    def _rows():
+        for hash_str, class_def in classes_data.items():
+            yield (
+                int(hash_str),
+                _pack(class_def),  # Store the full JSON
+                (class_def.get("displayProperties") or _EMPTY).get("name", ""),
+                class_def.get("classType", -1)
+            )
+
+    # Upsert so only changed rows are rewritten
+    _execute_multirow(cursor, _UPSERT_CLASS_PREFIX, _UPSERT_CLASS_SUFFIX, _rows(), row_width=4)
+
+    logger.info(f"Stored {len(classes_data)} classes in database")
 
-def store_damage_types(conn: sqlite3.Connection, damage_types_data: Dict[str, Any]) -> None:
+def store_damage_types(cursor: sqlite3.Cursor, damage_types_data: Dict[str, Any]) -> None:
     """Store damage type definitions in the database."""
-    cursor = conn.cursor()
-    
-    # Delete existing data
-    cursor.execute("DELETE FROM damage_types")
-    
-    # Process and insert damage types
-    damage_types = []
-    for hash_str, damage_type in damage_types_data.items():
-        # Convert string hash to integer
-        damage_hash = int(hash_str)
-        
-        # Extract fields
-        display_props = damage_type.get("displayProperties", {})
-        name = display_props.get("name", "")
-        description = display_props.get("description", "")
-        icon = display_props.get("icon", "")
-        enum_value = damage_type.get("enumValue", 0)
-        
-        # Store the full JSON
-        json_data = json.dumps(damage_type)
-        
-        damage_types.append((damage_hash, json_data, name, description, icon, enum_value))
-    
-    # Batch insert
-    cursor.executemany(
-        '''INSERT INTO damage_types 
-           (hash, json_data, name, description, icon, enum_value) 
-           VALUES (?, ?, ?, ?, ?, ?)''', 
-        damage_types
-    )
-    
-    conn.commit()
-    logger.info(f"Stored {len(damage_types)} damage types in database")
+    # Yield rows lazily instead of materializing the full tuple list
+    def _rows():
+        for hash_str, damage_type in damage_types_data.items():
+            display_props = damage_type.get("displayProperties") or _EMPTY
+
+            yield (
+                int(hash_str),
+                _pack(damage_type),  # Store the full JSON
+                display_props.get("name", ""),
+                display_props.get("description", ""),
+                display_props.get("icon", ""),
+                damage_type.get("enumValue", 0)
+            )
+
+    # Upsert so only changed rows are rewritten
+    _execute_multirow(cursor, _UPSERT_DAMAGE_TYPE_PREFIX, _UPSERT_DAMAGE_TYPE_SUFFIX, _rows(), row_width=6)
+
+    logger.info(f"Stored {len(damage_types_data)} damage types in database")
+
+# Query functions for accessing stored data - these borrow read-only
+# connections from the module pool rather than taking one from the caller
+@functools.lru_cache(maxsize=4096)
+def get_item_by_hash(item_hash: int) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve an item by its hash ID.
+
+    Results are LRU-cached - this is the hottest read path and a cache hit
+    skips both the B-tree lookup and the JSON decode. The cache is cleared
+    after every ingest.
+    """
+    with _read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT json_data FROM inventory_items WHERE hash = ?", (item_hash,))
+        result = cursor.fetchone()
 
-# Query functions for accessing stored data
-def get_item_by_hash(conn: sqlite3.Connection, item_hash: int) -> Optional[Dict[str, Any]]:
-    """Retrieve an item by its hash ID."""
-    cursor = conn.cursor()
-    cursor.execute("SELECT json_data FROM inventory_items WHERE hash = ?", (item_hash,))
-    result = cursor.fetchone()
-    
     if result:
-        return json.loads(result[0])
+        return _unpack(result[0])
     return None
 
-def search_items_by_name(conn: sqlite3.Connection, name_pattern: str) -> List[Dict[str, Any]]:
+def search_items_by_name(name_pattern: str) -> List[Dict[str, Any]]:
     """Search for items by name pattern."""
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT hash, name, item_type, tier_type FROM inventory_items WHERE name LIKE ?", 
-        (f"%{name_pattern}%",)
-    )
-    
-    results = []
-    for row in cursor.fetchall():
-        results.append({
-            "hash": row[0],
-            "name": row[1],
-            "itemType": row[2],
-            "tierType": row[3]
-        })
-    
-    return results
+    with _read_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Prefix-match against the FTS index instead of a full-table LIKE scan
+            fts_query = '"' + name_pattern.replace('"', '""') + '"*'
+            cursor.execute(
+                '''SELECT i.hash, i.name, i.item_type AS itemType, i.tier_type AS tierType
+                   FROM items_fts f
+                   JOIN inventory_items i ON i.hash = f.rowid
+                   WHERE items_fts MATCH ?''',
+                (fts_query,)
+            )
+        except sqlite3.OperationalError:
+            # FTS5 table not present - fall back to the LIKE scan
+            cursor.execute(
+                "SELECT hash, name, item_type AS itemType, tier_type AS tierType "
+                "FROM inventory_items WHERE name LIKE ?",
+                (f"%{name_pattern}%",)
+            )
 
-def get_items_by_type(conn: sqlite3.Connection, item_type: str) -> List[Dict[str, Any]]:
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_items_by_type(item_type: str) -> List[Dict[str, Any]]:
     """Get all items of a specific type."""
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT hash, name, tier_type FROM inventory_items WHERE item_type = ?", 
-        (item_type,)
-    )
-    
-    results = []
-    for row in cursor.fetchall():
-        results.append({
-            "hash": row[0],
-            "name": row[1],
-            "tierType": row[2]
-        })
-    
-    return results
+    with _read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT hash, name, tier_type AS tierType FROM inventory_items WHERE item_type = ?",
+            (item_type,)
+        )
 
-def get_weapons_by_damage_type(conn: sqlite3.Connection, damage_type: int) -> List[Dict[str, Any]]:
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_weapons_by_damage_type(damage_type: int) -> List[Dict[str, Any]]:
     """Get weapons of a specific damage type."""
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT i.hash, i.name, i.item_type, i.tier_type, d.name as damage_name
-        FROM inventory_items i
-        JOIN damage_types d ON i.damage_type = d.enum_value
-        WHERE i.damage_type = ? AND i.item_type LIKE '%Weapon%'
-        """, 
-        (damage_type,)
-    )
-    
-    results = []
-    for row in cursor.fetchall():
-        results.append({
-            "hash": row[0],
-            "name": row[1],
-            "itemType": row[2],
-            "tierType": row[3],
-            "damageName": row[4]
-        })
-    
-    return results
+    with _read_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Indexed scan of the materialized view instead of re-running
+            # the JOIN + LIKE filter over the whole items table
+            cursor.execute(
+                """
+                SELECT hash, name, item_type AS itemType, tier_type AS tierType,
+                       damage_name AS damageName
+                FROM weapons_view
+                WHERE damage_type = ?
+                """,
+                (damage_type,)
+            )
+        except sqlite3.OperationalError:
+            # Database predates weapons_view - fall back to the live JOIN
+            cursor.execute(
+                """
+                SELECT i.hash, i.name, i.item_type AS itemType, i.tier_type AS tierType,
+                       d.name AS damageName
+                FROM inventory_items i
+                JOIN damage_types d ON i.damage_type = d.enum_value
+                WHERE i.damage_type = ? AND i.item_type LIKE '%Weapon%'
+                """,
+                (damage_type,)
+            )
 
-def get_weapons_by_tier(conn: sqlite3.Connection, tier_type: str) -> List[Dict[str, Any]]:
+        return [dict(row) for row in cursor.fetchall()]
+
+def get_weapons_by_tier(tier_type: str) -> List[Dict[str, Any]]:
     """Get weapons of a specific rarity tier (Common, Rare, Legendary, etc)."""
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT hash, name, item_type, tier_type
-        FROM inventory_items
-        WHERE tier_type = ? AND item_type LIKE '%Weapon%'
-        ORDER BY name
-        """, 
-        (tier_type,)
-    )
-    
-    results = []
-    for row in cursor.fetchall():
-        results.append({
-            "hash": row[0],
-            "name": row[1],
-            "itemType": row[2],
-            "tierType": row[3]
-        })
-    
-    return results
+    with _read_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            # Indexed scan of the materialized view
+            cursor.execute(
+                """
+                SELECT hash, name, item_type AS itemType, tier_type AS tierType
+                FROM weapons_view
+                WHERE tier_type = ?
+                ORDER BY name
+                """,
+                (tier_type,)
+            )
+        except sqlite3.OperationalError:
+            # Database predates weapons_view - fall back to the table scan
+            cursor.execute(
+                """
+                SELECT hash, name, item_type AS itemType, tier_type AS tierType
+                FROM inventory_items
+                WHERE tier_type = ? AND item_type LIKE '%Weapon%'
+                ORDER BY name
+                """,
+                (tier_type,)
+            )
+
+        return [dict(row) for row in cursor.fetchall()]
 
-def get_class_items(conn: sqlite3.Connection, class_type: int) -> List[Dict[str, Any]]:
+def get_class_items(class_type: int) -> List[Dict[str, Any]]:
     """Get items for a specific class."""
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT hash, name, item_type, tier_type
-        FROM inventory_items
-        WHERE class_type = ? AND equippable = 1
-        ORDER BY item_type, tier_type DESC
-        """, 
-        (class_type,)
-    )
-    
-    results = []
-    for row in cursor.fetchall():
-        results.append({
-            "hash": row[0],
-            "name": row[1],
-            "itemType": row[2],
-            "tierType": row[3]
-        })
-    
-    return results
+    with _read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT hash, name, item_type AS itemType, tier_type AS tierType
+            FROM inventory_items
+            WHERE class_type = ? AND equippable = 1
+            ORDER BY item_type, tier_type DESC
+            """,
+            (class_type,)
+        )
+
+        return [dict(row) for row in cursor.fetchall()]
 
 async def update_database(force_update: bool = False) -> None:
     """
@@ -479,18 +772,65 @@ async def update_database(force_update: bool = False) -> None:
     """
     # Create the database if it doesn't exist
     conn = create_database()
-    
-    # Fetch and store each component
-    for component_type in COMPONENTS_TO_FETCH:
+
+    # Drop the secondary indexes for the duration of the bulk load so each
+    # INSERT doesn't also update four B-trees; they're rebuilt below. The
+    # drop is deferred until the first component that actually needs
+    # storing, so the common everything-up-to-date run never touches them.
+    indexes_dropped = False
+
+    def _drop_indexes_once() -> None:
+        nonlocal indexes_dropped
+        if not indexes_dropped:
+            drop_indexes(conn)
+            indexes_dropped = True
+
+    # Fetch all components concurrently - the fetches are independent network
+    # calls, so overlapping them hides most of the Bungie API latency
+    try:
+        fetch_results = await asyncio.gather(
+            *(fetch_component(component_type) for component_type in COMPONENTS_TO_FETCH),
+            return_exceptions=True
+        )
+    finally:
+        # The fetches share one pooled HTTP session; close it now that all
+        # network work is done
+        await close_session()
+
+    # Store sequentially on the single connection (SQLite is single-writer)
+    for component_type, fetch_result in zip(COMPONENTS_TO_FETCH, fetch_results):
+        if isinstance(fetch_result, BaseException):
+            logger.error(f"Error fetching {component_type}: {fetch_result}")
+            continue
+        if fetch_result is None:
+            continue
+
         try:
-            updated = await fetch_and_store_component(conn, component_type, force_update)
+            updated = store_component(
+                conn,
+                component_type,
+                fetch_result["componentData"],
+                force_update,
+                before_store=_drop_indexes_once
+            )
             if updated:
                 logger.info(f"Updated {component_type}")
             else:
                 logger.info(f"No update needed for {component_type}")
         except Exception as e:
             logger.error(f"Error updating {component_type}: {e}")
-    
+
+    # Refresh the materialized weapons view now that both of its base
+    # tables are loaded, then rebuild the indexes and ANALYZE so the
+    # planner has fresh statistics. Skipped entirely when no component
+    # changed - nothing was dropped and the view still matches its bases.
+    if indexes_dropped:
+        refresh_weapons_view(conn)
+        rebuild_indexes(conn)
+
+    # Let SQLite refresh its query planner statistics before closing
+    conn.execute("PRAGMA optimize")
+
     # Close the connection when done
     conn.close()
 
@@ -506,10 +846,15 @@ def print_table(results: List[Dict[str, Any]], fields: List[str], title: str = N
         print(f"\n{title}")
         print("-" * len(title))
     
-    # Calculate column widths
-    widths = {}
-    for field in fields:
-        widths[field] = max(len(field), max(len(str(item.get(field, ""))) for item in results))
+    # Calculate column widths in a single pass over the results instead of
+    # one full scan per field, skipping str() for values already strings
+    widths = {field: len(field) for field in fields}
+    for item in results:
+        for field in fields:
+            value = item.get(field, "")
+            length = len(value) if isinstance(value, str) else len(str(value))
+            if length > widths[field]:
+                widths[field] = length
     
     # Print headers
     header = "  ".join(f"{field:{widths[field]}}" for field in fields)
@@ -571,22 +916,20 @@ async def main():
             print(f"Database {DB_FILENAME} not found. Please run with --update first.")
             return
         
-        # Connect to the database
-        conn = sqlite3.connect(DB_FILENAME)
-        
         try:
-            # Run the requested query
+            # Run the requested query - helpers draw read-only connections
+            # from the module pool
             if args.query == "examples":
-                run_example_queries(conn)
+                run_example_queries()
             elif args.query == "search" and args.param:
-                results = search_items_by_name(conn, args.param)
+                results = search_items_by_name(args.param)
                 print_table(
                     results,
                     ["hash", "name", "itemType", "tierType"],
                     f"Search results for '{args.param}'"
                 )
             elif args.query == "item" and args.param:
-                item = get_item_by_hash(conn, int(args.param))
+                item = get_item_by_hash(int(args.param))
                 if item:
                     print(f"\nDetails for item with hash {args.param}:")
                     print(f"Name: {item.get('displayProperties', {}).get('name', 'Unknown')}")
@@ -596,28 +939,28 @@ async def main():
                 else:
                     print(f"No item found with hash {args.param}")
             elif args.query == "type" and args.param:
-                results = get_items_by_type(conn, args.param)
+                results = get_items_by_type(args.param)
                 print_table(
                     results,
                     ["hash", "name", "tierType"],
                     f"Items of type '{args.param}'"
                 )
             elif args.query == "class" and args.param:
-                results = get_class_items(conn, int(args.param))
+                results = get_class_items(int(args.param))
                 print_table(
                     results,
                     ["hash", "name", "itemType", "tierType"],
                     f"Items for class type {args.param}"
                 )
             elif args.query == "damage" and args.param:
-                results = get_weapons_by_damage_type(conn, int(args.param))
+                results = get_weapons_by_damage_type(int(args.param))
                 print_table(
                     results,
                     ["hash", "name", "itemType", "tierType", "damageName"],
                     f"Weapons with damage type {args.param}"
                 )
             elif args.query == "tier" and args.param:
-                results = get_weapons_by_tier(conn, args.param)
+                results = get_weapons_by_tier(args.param)
                 print_table(
                     results,
                     ["hash", "name", "itemType", "tierType"],
@@ -626,37 +969,43 @@ async def main():
             else:
                 print("Invalid query or missing parameter. Use --help for more information.")
         finally:
-            # Close the connection
-            conn.close()
+            # Drain the pool so borrowed connections are closed cleanly
+            while not _read_pool.empty():
+                _read_pool.get_nowait().close()
 
-def run_example_queries(conn: sqlite3.Connection) -> None:
+def run_example_queries() -> None:
     """Run example queries to demonstrate database usage."""
     print("\nRunning example queries to demonstrate database usage...\n")
     
     # Example 1: Search for items containing "Gjallarhorn"
     print("Example 1: Searching for items containing 'Gjallarhorn'")
-    gjallarhorn_results = search_items_by_name(conn, "Gjallarhorn")
+    gjallarhorn_results = search_items_by_name("Gjallarhorn")
     print_table(gjallarhorn_results, ["hash", "name", "itemType", "tierType"])
     
     # Example 2: Get all Hand Cannons
     print("\nExample 2: Getting all items of type 'Hand Cannon'")
-    hand_cannons = get_items_by_type(conn, "Hand Cannon")
+    hand_cannons = get_items_by_type("Hand Cannon")
     print_table(hand_cannons[:10], ["hash", "name", "tierType"])
     print(f"...and {len(hand_cannons) - 10} more Hand Cannons" if len(hand_cannons) > 10 else "")
     
     # Example 3: Get Solar damage weapons
     print("\nExample 3: Getting Solar damage weapons")
-    solar_weapons = get_weapons_by_damage_type(conn, 1)  # 1 is typically Solar
+    solar_weapons = get_weapons_by_damage_type(1)  # 1 is typically Solar
     print_table(solar_weapons[:10], ["hash", "name", "itemType", "damageName"])
     print(f"...and {len(solar_weapons) - 10} more Solar weapons" if len(solar_weapons) > 10 else "")
     
     # Example 4: Get Exotic tier weapons
     print("\nExample 4: Getting Exotic tier weapons")
-    exotic_weapons = get_weapons_by_tier(conn, "Exotic")
+    exotic_weapons = get_weapons_by_tier("Exotic")
     print_table(exotic_weapons[:10], ["hash", "name", "itemType"])
     print(f"...and {len(exotic_weapons) - 10} more Exotic weapons" if len(exotic_weapons) > 10 else "")
     
     # Get database stats
+    with _read_connection() as conn:
+        _print_database_stats(conn)
+
+def _print_database_stats(conn: sqlite3.Connection) -> None:
+    """Print row counts and component versions for the database."""
     cursor = conn.cursor()
     
     # Get component counts
@@ -6,19 +6,68 @@ without dependencies on the rest of the API client.
 """
 import os
 import asyncio
+import json
 import logging
+import time
 import aiohttp
-from typing import Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 from dotenv import load_dotenv
 
+# orjson parses the multi-megabyte manifest components several times faster
+# than stdlib json. Fall back to stdlib json if it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson else json.loads
+
+# pysimdjson can parse lazily, materializing only the keys actually touched.
+# We use it for field projections so untouched entries never allocate dicts.
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Advertise brotli only when the decoder is importable - aiohttp decompresses
+# transparently but needs the brotli package to handle a br-encoded body.
+try:
+    import brotli  # noqa: F401 - presence check only; aiohttp uses it internally
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# msgpack decodes 3-5x faster than JSON at equal byte counts, so cached
+# components are stored as msgpack when it's installed; JSON bytes otherwise.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Compress cached components with zstd when available - the manifest JSON
+# shrinks roughly 5x. Plain JSON files are written otherwise.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# aiohttp's AsyncResolver needs aiodns; the threaded default resolver is
+# used otherwise. Either way the connector caches lookups aggressively.
+try:
+    import aiodns  # noqa: F401 - presence check for aiohttp.AsyncResolver
+    _HAS_AIODNS = True
+except ImportError:
+    _HAS_AIODNS = False
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Module logger - configuring handlers/levels is left to the application
+# entry point so importing this module doesn't hijack global logging
 logger = logging.getLogger(__name__)
 
 # Get API key from environment variables (loaded from .env file)
@@ -30,21 +79,339 @@ if BUNGIE_API_KEY:
 else:
     logger.warning("No Bungie API key found in environment variables")
 
+# Shared HTTP session - creating a ClientSession per request throws away the
+# connection pool, so every call would pay a fresh TCP+TLS handshake
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+def _default_headers() -> Dict[str, str]:
+    """Static header set applied once to the session instead of per request."""
+    headers = {
+        "Accept": "application/json",
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "User-Agent": "VanguardViz/1.0 (+https://github.com/BaronVonCaelum/Vanguard_Viz)"
+    }
+    if BUNGIE_API_KEY:
+        headers["X-API-Key"] = BUNGIE_API_KEY
+    return headers
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session, creating it lazily on first use.
+    Keep-alive connections in its pool are reused across requests, and the
+    fixed headers ride along without rebuilding a dict per call.
+    """
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        # Everything goes to www.bungie.net, so cache its resolution for ten
+        # minutes and skip a DNS round-trip whenever connections churn
+        _SESSION = aiohttp.ClientSession(
+            headers=_default_headers(),
+            connector=aiohttp.TCPConnector(
+                resolver=aiohttp.AsyncResolver() if _HAS_AIODNS else None,
+                limit=32,
+                limit_per_host=8,
+                use_dns_cache=True,
+                ttl_dns_cache=600,
+                keepalive_timeout=75
+            )
+        )
+    return _SESSION
+
+async def close_session() -> None:
+    """Close the shared session. Call once at shutdown."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+# Component cache. Bungie only changes component content when the manifest
+# version bumps, so caching on (component, version) lets repeat calls skip
+# the >50MB download - and, for same-process calls, the JSON parse as well.
+CACHE_DIR = Path("~/.cache/vanguard_viz").expanduser()
+_COMPONENT_CACHE: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+# Shared future for the top-level manifest index, so concurrent component
+# fetches in one batch issue a single index request between them. The cached
+# index is considered fresh for six hours - Bungie bumps the manifest at most
+# a few times a week - after which the next caller refreshes it.
+_INDEX_FUTURE: Optional["asyncio.Future[Dict[str, Any]]"] = None
+_INDEX_EXPIRY: float = 0.0
+_INDEX_TTL = 6 * 3600
+
+async def _fetch_manifest_index(used_api_key: str) -> Dict[str, Any]:
+    """
+    Fetch the top-level manifest index, sharing one in-flight request among
+    concurrent callers (single-flight) and caching the result for a few
+    hours. Returns the manifest "Response" dict, or a dict with an "error"
+    key on failure (failures are not cached, so the next call retries).
+    """
+    global _INDEX_FUTURE, _INDEX_EXPIRY
+    now = time.monotonic()
+    if _INDEX_FUTURE is None or (_INDEX_FUTURE.done() and now >= _INDEX_EXPIRY):
+        _INDEX_FUTURE = asyncio.ensure_future(_request_manifest_index(used_api_key))
+        _INDEX_EXPIRY = now + _INDEX_TTL
+    future = _INDEX_FUTURE
+    try:
+        manifest_data = await future
+    except BaseException:
+        # Raised exceptions are not cached either: clear the future
+        # before re-raising so one network blip doesn't pin the failure
+        # for the whole TTL
+        if _INDEX_FUTURE is future:
+            _INDEX_FUTURE = None
+        raise
+    if "error" in manifest_data and _INDEX_FUTURE is future:
+        _INDEX_FUTURE = None
+    return manifest_data
+
+# The index body and its ETag are persisted so a cold process can revalidate
+# with If-None-Match: a 304 reply carries no body, versus re-downloading and
+# re-parsing the full index JSON on every start.
+_INDEX_CACHE_PATH = CACHE_DIR / "manifest-index.json"
+_INDEX_ETAG_PATH = CACHE_DIR / "manifest.etag"
+
+def _read_index_cache() -> Tuple[Optional[str], Optional[bytes]]:
+    """Return the persisted (etag, index body bytes), or Nones on a miss."""
+    try:
+        etag = _INDEX_ETAG_PATH.read_text().strip()
+        body = _INDEX_CACHE_PATH.read_bytes()
+    except OSError:
+        return None, None
+    return (etag or None), body
+
+def _write_index_cache(etag: Optional[str], body: bytes) -> None:
+    """Persist the index body and its ETag for conditional revalidation."""
+    if not etag:
+        return
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _INDEX_CACHE_PATH.write_bytes(body)
+        _INDEX_ETAG_PATH.write_text(etag)
+    except OSError as e:
+        logger.warning("Could not write manifest index cache: %s", e)
+
+async def _request_manifest_index(used_api_key: str) -> Dict[str, Any]:
+    """Issue the actual manifest index request, revalidating with ETag."""
+    manifest_url = "https://www.bungie.net/Platform/Destiny2/Manifest/"
+    # The session already carries the environment API key; only override the
+    # header when the caller supplied a different key explicitly
+    headers = {}
+    if used_api_key != BUNGIE_API_KEY:
+        headers["X-API-Key"] = used_api_key
+    etag, cached_body = _read_index_cache()
+    if etag and cached_body is not None:
+        headers["If-None-Match"] = etag
+
+    logger.info("Fetching Destiny 2 manifest from %s", manifest_url)
+    session = await get_session()
+    async with session.get(manifest_url, headers=headers or None) as response:
+        if response.status == 304 and cached_body is not None:
+            logger.info("Manifest index unchanged (304), using cached body")
+            manifest_response = _loads(cached_body)
+            return manifest_response.get("Response", {})
+
+        raw_body = await response.read()
+        manifest_response = _loads(raw_body)
+        if response.status != 200 or "Response" not in manifest_response:
+            error_msg = manifest_response.get('Message', 'Unknown error')
+            logger.error("Failed to get manifest: %s", error_msg)
+            return {"error": f"Failed to retrieve Destiny 2 manifest: {error_msg}"}
+
+        _write_index_cache(response.headers.get("ETag"), raw_body)
+        return manifest_response.get("Response", {})
+
+def _project_fields(
+    component_data: Any,
+    fields: Tuple[str, ...]
+) -> Dict[str, Any]:
+    """
+    Materialize only the given dot-separated field paths for each entry.
+    
+    Works over either a plain dict or a lazy simdjson document; with the
+    latter, entries and sub-objects outside the projection are never built
+    as Python objects.
+    """
+    paths = [field.split(".") for field in fields]
+    slim: Dict[str, Any] = {}
+    for entry_hash, entry in component_data.items():
+        slim_entry: Dict[str, Any] = {}
+        for parts in paths:
+            value = entry
+            for part in parts:
+                try:
+                    value = value[part]
+                except (KeyError, TypeError):
+                    value = None
+                    break
+            if value is not None:
+                target = slim_entry
+                for part in parts[:-1]:
+                    target = target.setdefault(part, {})
+                target[parts[-1]] = value
+        slim[entry_hash] = slim_entry
+    return slim
+
+def _parse_component(raw_bytes: bytes, fields: Optional[Tuple[str, ...]]) -> Any:
+    """
+    Parse component payload bytes, projecting to the requested fields if
+    given. The payload may be JSON (network or legacy cache) or msgpack
+    (binary cache); the leading byte tells them apart.
+    """
+    if raw_bytes[:1] not in (b"{", b"["):
+        # Binary cache payload - decoding skips JSON tokenization entirely
+        if not msgpack:
+            raise RuntimeError(
+                "Cache contains a msgpack payload but msgpack is not installed"
+            )
+        component_data = msgpack.unpackb(raw_bytes, raw=False)
+        if fields:
+            return _project_fields(component_data, fields)
+        return component_data
+    if fields:
+        if simdjson:
+            # Lazy parse: only the projected paths allocate Python objects
+            return _project_fields(simdjson.Parser().parse(raw_bytes), fields)
+        return _project_fields(_loads(raw_bytes), fields)
+    return _loads(raw_bytes)
+
+# Even orjson holds the GIL for the ~100ms it takes to decode a 40-100MB
+# component, which stalls every other coroutine. Parses above this size go
+# to a small process pool so they overlap with the other downloads in a
+# batch; smaller payloads stay on a worker thread where the fork/pickle
+# round-trip isn't worth it.
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+_PARSE_POOL_THRESHOLD = 8 * 1024 * 1024
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Return the lazily-created decode pool."""
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        _PARSE_POOL = ProcessPoolExecutor(max_workers=2)
+    return _PARSE_POOL
+
+async def _parse_component_async(
+    raw_bytes: bytes,
+    fields: Optional[Tuple[str, ...]]
+) -> Any:
+    """Parse component bytes off the event loop."""
+    if len(raw_bytes) >= _PARSE_POOL_THRESHOLD:
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                _get_parse_pool(), _parse_component, raw_bytes, fields
+            )
+        except OSError as e:
+            # Environments that forbid forking fall through to the thread
+            logger.warning("Process-pool decode unavailable, using a thread: %s", e)
+    return await asyncio.to_thread(_parse_component, raw_bytes, fields)
+
+# Cache file extensions in preference order; reads also accept the formats
+# this process can't write so caches survive codec installs/uninstalls
+_CACHE_SUFFIXES = (".mp.zst", ".mp", ".json.zst", ".json")
+
+def _cache_path(component_type: str, version: str) -> Path:
+    """Return the preferred on-disk cache location for a component."""
+    base = ".mp" if msgpack else ".json"
+    suffix = base + (".zst" if zstandard else "")
+    return CACHE_DIR / f"{component_type}-{version}{suffix}"
+
+def _read_cached_component(component_type: str, version: str) -> Optional[bytes]:
+    """
+    Return the cached payload bytes (msgpack or JSON) for a component, or
+    None on a miss. Payloads this process lacks a codec for are skipped.
+    """
+    for suffix in _CACHE_SUFFIXES:
+        path = CACHE_DIR / f"{component_type}-{version}{suffix}"
+        try:
+            data = path.read_bytes()
+        except OSError:
+            continue
+        if data[:4] == ZSTD_MAGIC:
+            if not zstandard:
+                continue
+            data = zstandard.ZstdDecompressor().decompress(data)
+        if data[:1] not in (b"{", b"[") and not msgpack:
+            continue
+        return data
+    return None
+
+def _write_cached_component(
+    component_type: str,
+    version: str,
+    raw_bytes: bytes,
+    component_data: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Persist a component payload, compressed when zstd is available. Given
+    the full parsed structure and msgpack, the cache is written as msgpack
+    so later loads skip JSON tokenization; raw JSON bytes otherwise.
+    """
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _cache_path(component_type, version)
+        if msgpack and component_data is not None:
+            payload = msgpack.packb(component_data, use_bin_type=True)
+        else:
+            payload = raw_bytes
+        if zstandard:
+            payload = zstandard.ZstdCompressor(level=3).compress(payload)
+        # Write to a temp file and rename so readers never see partial data
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_bytes(payload)
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.warning("Could not write manifest cache for %s: %s", component_type, e)
+
+# In-flight component fetches, keyed by (component, api key, projection).
+# Concurrent callers for the same component join the existing future instead
+# of issuing duplicate ~50MB downloads and parses (single-flight).
+_INFLIGHT: Dict[Tuple[str, Optional[str], Optional[Tuple[str, ...]]], "asyncio.Future[Dict[str, Any]]"] = {}
+
 async def get_manifest_component(
     component_type: str = "DestinyInventoryItemDefinition",
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None
 ) -> Dict[str, Any]:
     """
     Retrieves a specific component from the Destiny 2 Manifest.
     
+    Concurrent calls for the same component share one download and parse.
+    
     Args:
         component_type: The manifest component to retrieve. Default is "DestinyInventoryItemDefinition".
                         Other examples include "DestinyClassDefinition", "DestinySandboxPerkDefinition", etc.
         api_key: Optional Bungie API key. If not provided, will use BUNGIE_API_KEY from environment variables.
+        fields: Optional dot-separated field paths (e.g. "displayProperties.name").
+                When given, componentData holds only those fields per entry,
+                which keeps peak memory proportional to the projection rather
+                than the full 40-100MB definition tree.
         
     Returns:
         Dict containing the requested manifest component data
     """
+    if fields is not None:
+        fields = tuple(fields)
+    
+    key = (component_type, api_key, fields)
+    existing = _INFLIGHT.get(key)
+    if existing is not None:
+        return await existing
+    
+    future = asyncio.ensure_future(
+        _fetch_manifest_component(component_type, api_key, fields)
+    )
+    _INFLIGHT[key] = future
+    try:
+        return await future
+    finally:
+        _INFLIGHT.pop(key, None)
+
+async def _fetch_manifest_component(
+    component_type: str,
+    api_key: Optional[str],
+    fields: Optional[Tuple[str, ...]]
+) -> Dict[str, Any]:
+    """Fetch one component; the public wrapper coalesces concurrent callers."""
     # Use provided API key or environment variable
     used_api_key = api_key or BUNGIE_API_KEY
     
@@ -54,24 +421,12 @@ async def get_manifest_component(
         }
     
     try:
-        # Step 1: Get the manifest
-        manifest_url = "https://www.bungie.net/Platform/Destiny2/Manifest/"
-        headers = {
-            "X-API-Key": used_api_key
-        }
-        
-        # Make request to get the manifest paths
-        logger.info(f"Fetching Destiny 2 manifest from {manifest_url}")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(manifest_url, headers=headers) as response:
-                manifest_response = await response.json()
-                if response.status != 200 or "Response" not in manifest_response:
-                    error_msg = manifest_response.get('Message', 'Unknown error')
-                    logger.error(f"Failed to get manifest: {error_msg}")
-                    return {"error": f"Failed to retrieve Destiny 2 manifest: {error_msg}"}
-                
-                manifest_data = manifest_response.get("Response", {})
-        
+        # Step 1: Get the manifest index (shared with concurrent callers)
+        manifest_data = await _fetch_manifest_index(used_api_key)
+        if "error" in manifest_data:
+            return manifest_data
+        session = await get_session()
+
         # Step 2: Extract the path for the requested component
         if "jsonWorldComponentContentPaths" not in manifest_data or "en" not in manifest_data["jsonWorldComponentContentPaths"]:
             logger.error("Manifest data does not contain jsonWorldComponentContentPaths or language data")
@@ -79,45 +434,247 @@ async def get_manifest_component(
             
         content_paths = manifest_data["jsonWorldComponentContentPaths"]["en"]
         if component_type not in content_paths:
-            logger.error(f"Component type {component_type} not found in manifest")
+            logger.error("Component type %s not found in manifest", component_type)
             return {"error": f"Component type {component_type} not found in manifest"}
             
         component_path = content_paths[component_type]
         
-        # Step 3: Construct the full URL
+        # Step 3: Check the caches before downloading - the component only
+        # changes when the manifest version does
+        version = manifest_data.get("version", "")
+        if version:
+            cache_key = (component_type, version, fields)
+            cached = _COMPONENT_CACHE.get(cache_key)
+            if cached is not None:
+                logger.info("Using in-process cached %s for version %s", component_type, version)
+                return cached
+            
+            cached_bytes = _read_cached_component(component_type, version)
+            if cached_bytes is not None:
+                logger.info("Using disk-cached %s for version %s", component_type, version)
+                result = {
+                    "status": "success",
+                    "componentType": component_type,
+                    "componentData": await _parse_component_async(cached_bytes, fields)
+                }
+                _COMPONENT_CACHE[cache_key] = result
+                return result
+        
+        # Step 4: Construct the full URL
         component_url = f"https://www.bungie.net{component_path}"
         
-        # Step 4: Make second call to get the actual definitions
-        logger.info(f"Fetching manifest component: {component_type} from {component_url}")
+        # Step 5: Make second call to get the actual definitions
+        logger.info("Fetching manifest component: %s from %s", component_type, component_url)
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(component_url) as response:
-                    if response.status != 200:
-                        logger.error(f"Failed to get component data: {response.status}")
-                        return {"error": f"Failed to retrieve component data: {response.status}"}
-                    
-                    # Parse the response - can be large so we handle with care
-                    component_data = await response.json()
-                    
-                    # Check if we got valid data
-                    if not isinstance(component_data, dict):
-                        logger.error(f"Received invalid data format for {component_type}")
-                        return {"error": f"Invalid data format received for {component_type}"}
-                    
-                    logger.info(f"Successfully retrieved {component_type} with {len(component_data)} entries")
-                    return {
-                        "status": "success",
-                        "componentType": component_type,
-                        "componentData": component_data
-                    }
+            # Accept/Accept-Encoding are session defaults, so the brotli
+            # negotiation from the large payload path rides along for free
+            async with session.get(component_url) as response:
+                if response.status != 200:
+                    logger.error("Failed to get component data: %s", response.status)
+                    return {"error": f"Failed to retrieve component data: {response.status}"}
+
+                # Read the raw bytes so the parse can run off the loop
+                raw_bytes = await response.read()
+
+                # Parse the response - can be large so we handle with care.
+                # Run the decode on a worker thread so the ~100ms parse of a
+                # multi-MB payload doesn't stall other coroutines on the loop.
+                component_data = await _parse_component_async(raw_bytes, fields)
+
+                # Check if we got valid data
+                if not isinstance(component_data, dict):
+                    logger.error("Received invalid data format for %s", component_type)
+                    return {"error": f"Invalid data format received for {component_type}"}
+
+                logger.info("Successfully retrieved %s with %s entries", component_type, len(component_data))
+                result = {
+                    "status": "success",
+                    "componentType": component_type,
+                    "componentData": component_data
+                }
+                if version:
+                    # Projected data is partial, so only cache the parsed
+                    # structure in binary form when it's the full component
+                    _write_cached_component(
+                        component_type, version, raw_bytes,
+                        component_data if not fields else None
+                    )
+                    _COMPONENT_CACHE[(component_type, version, fields)] = result
+                return result
         except Exception as e:
-            logger.error(f"Error fetching component data: {e}")
+            logger.error("Error fetching component data: %s", e)
             return {"error": f"Failed to retrieve or parse component data: {e}"}
     
     except Exception as e:
-        logger.error(f"Unexpected error retrieving manifest component: {e}")
+        logger.error("Unexpected error retrieving manifest component: %s", e)
         return {"error": f"Unexpected error: {e}"}
 
+async def get_manifest_component_columns(
+    component_type: str,
+    fields: Tuple[str, ...],
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Retrieve a component as a struct-of-arrays projection.
+
+    Instead of one dict per entry (which costs roughly a kilobyte of object
+    overhead each across 40k+ items), the result holds parallel lists: a
+    "hash" column plus one column per requested dot-separated field path,
+    aligned by index. Columnar scans over a single field then touch one
+    contiguous list rather than walking the whole dict graph.
+
+    Args:
+        component_type: The manifest component to retrieve.
+        fields: Dot-separated field paths to extract per entry.
+        api_key: Optional Bungie API key, as for get_manifest_component.
+
+    Returns:
+        Dict with "status", "componentType" and "columns" on success, or the
+        underlying error dict on failure
+    """
+    fields = tuple(fields)
+    result = await get_manifest_component(component_type, api_key=api_key, fields=fields)
+    if result.get("status") != "success":
+        return result
+
+    component_data = result["componentData"]
+    columns: Dict[str, List[Any]] = {"hash": list(component_data.keys())}
+    for field in fields:
+        parts = field.split(".")
+        column: List[Any] = []
+        append = column.append
+        for entry in component_data.values():
+            value = entry
+            for part in parts:
+                try:
+                    value = value[part]
+                except (KeyError, TypeError):
+                    value = None
+                    break
+            append(value)
+        columns[field] = column
+
+    return {
+        "status": "success",
+        "componentType": component_type,
+        "columns": columns
+    }
+
+def _summarize_component(raw_bytes: bytes) -> Tuple[int, Optional[str], Any]:
+    """
+    Return (entry count, first hash, first entry) from component payload
+    bytes. With pysimdjson and a JSON payload the count and sample come off
+    the lazy document, so the other tens of thousands of entries are never
+    materialized as Python objects.
+    """
+    if raw_bytes[:1] in (b"{", b"[") and simdjson:
+        doc = simdjson.Parser().parse(raw_bytes)
+        count = len(doc)
+        for key in doc.keys():
+            entry = doc[key]
+            if hasattr(entry, "as_dict"):
+                entry = entry.as_dict()
+            return count, key, entry
+        return count, None, None
+    component_data = _parse_component(raw_bytes, None)
+    for key, entry in component_data.items():
+        return len(component_data), key, entry
+    return len(component_data), None, None
+
+async def get_manifest_component_summary(
+    component_type: str = "DestinyInventoryItemDefinition",
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Return the entry count and one sample entry for a component without
+    building the full definitions dict.
+
+    Demo and smoke-test callers only ever look at len() plus a single
+    entry; going through get_manifest_component for that materializes
+    every definition. This path reads the same caches and download but
+    summarizes the payload lazily.
+
+    Returns:
+        Dict with "status", "componentType", "count", "sampleHash" and
+        "sample" on success, or a dict with an "error" key
+    """
+    used_api_key = api_key or BUNGIE_API_KEY
+    if not used_api_key:
+        return {
+            "error": "No Bungie API key provided. Please set BUNGIE_API_KEY environment variable or pass api_key parameter."
+        }
+
+    try:
+        manifest_data = await _fetch_manifest_index(used_api_key)
+        if "error" in manifest_data:
+            return manifest_data
+
+        content_paths = manifest_data.get("jsonWorldComponentContentPaths", {}).get("en", {})
+        if component_type not in content_paths:
+            logger.error("Component type %s not found in manifest", component_type)
+            return {"error": f"Component type {component_type} not found in manifest"}
+
+        version = manifest_data.get("version", "")
+        raw_bytes = _read_cached_component(component_type, version) if version else None
+        if raw_bytes is None:
+            session = await get_session()
+            component_url = f"https://www.bungie.net{content_paths[component_type]}"
+            logger.info("Fetching manifest component for summary: %s", component_type)
+            async with session.get(component_url) as response:
+                if response.status != 200:
+                    logger.error("Failed to get component data: %s", response.status)
+                    return {"error": f"Failed to retrieve component data: {response.status}"}
+                raw_bytes = await response.read()
+            if version:
+                _write_cached_component(component_type, version, raw_bytes)
+
+        count, sample_hash, sample = await asyncio.to_thread(_summarize_component, raw_bytes)
+        return {
+            "status": "success",
+            "componentType": component_type,
+            "count": count,
+            "sampleHash": sample_hash,
+            "sample": sample
+        }
+    except Exception as e:
+        logger.error("Error summarizing manifest component: %s", e)
+        return {"error": f"Failed to summarize component data: {e}"}
+
+async def get_manifest_components(
+    component_types: List[str],
+    api_key: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+    max_concurrency: int = 6
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Retrieve several manifest components concurrently.
+
+    The manifest index is fetched once and shared, then the per-component
+    downloads overlap behind a semaphore, so wall-clock time is roughly the
+    slowest download rather than the sum of all of them.
+
+    Args:
+        component_types: Manifest component names to retrieve.
+        api_key: Optional Bungie API key, as for get_manifest_component.
+        fields: Optional field projection applied to every component.
+        max_concurrency: Maximum number of downloads in flight at once.
+
+    Returns:
+        Dict mapping each component type to its get_manifest_component result
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_one(component_type: str) -> Tuple[str, Dict[str, Any]]:
+        async with semaphore:
+            return component_type, await get_manifest_component(
+                component_type, api_key=api_key, fields=fields
+            )
+
+    results = await asyncio.gather(
+        *(fetch_one(component_type) for component_type in component_types)
+    )
+    return dict(results)
+
 async def main():
     """
     Main function to test the manifest component retrieval functionality.
@@ -125,10 +682,26 @@ async def main():
     print("Testing Destiny 2 Manifest Component Retrieval")
     print("=============================================\n")
     
-    # Test retrieving inventory item definitions
-    print("Retrieving Destiny Inventory Item Definitions...")
-    result = await get_manifest_component("DestinyInventoryItemDefinition")
-    
+    try:
+        # Test retrieving inventory item definitions. The demo only displays
+        # a few fields of one sample item, so project to just those instead
+        # of materializing the full 40k-entry definition tree.
+        print("Retrieving Destiny Inventory Item Definitions...")
+        result = await get_manifest_component(
+            "DestinyInventoryItemDefinition",
+            fields=(
+                "displayProperties.name",
+                "displayProperties.description",
+                "displayProperties.icon",
+                "itemTypeDisplayName"
+            )
+        )
+        await _report_result(result)
+    finally:
+        await close_session()
+
+async def _report_result(result: Dict[str, Any]) -> None:
+    """Print a summary of a manifest component fetch result."""
     if result.get("status") == "success":
         component_data = result.get("componentData", {})
         print(f"Successfully retrieved {len(component_data)} inventory item definitions")
@@ -151,5 +724,9 @@ async def main():
         print(f"Error retrieving inventory items: {result.get('error', 'Unknown error')}")
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     asyncio.run(main())
 
@@ -3,12 +3,69 @@ Bungie.net API Client for the Vanguard Viz Web Data Connector
 This module provides functions to interact with the Bungie.net API using BungIO
 """
 import os
+import sys
 import asyncio
+import functools
+import heapq
+import itertools
+import json
+import operator
 import logging
+import random
+import time
 import aiohttp
-from typing import Dict, Any, Optional, List, Union, Tuple
+import yarl
+from array import array
+from pathlib import Path
+from typing import AsyncIterator, Dict, Any, Iterator, Optional, List, Union, Tuple
 from datetime import datetime, timedelta
 
+# orjson parses the multi-megabyte manifest components several times faster
+# than stdlib json. Fall back to stdlib json if it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson else json.loads
+
+# pysimdjson can parse lazily, materializing only the keys actually touched.
+# Used for field projections so untouched entries never allocate dicts.
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# aiohttp's AsyncResolver needs aiodns; the threaded default resolver is
+# used otherwise. Either way the connector caches lookups aggressively.
+try:
+    import aiodns  # noqa: F401 - presence check for aiohttp.AsyncResolver
+    _HAS_AIODNS = True
+except ImportError:
+    _HAS_AIODNS = False
+
+# aiohttp only advertises Brotli when the codec is importable; it compresses
+# the big Bungie responses noticeably better than gzip.
+try:
+    import brotli  # noqa: F401 - presence check for Accept-Encoding
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# zstandard shrinks the on-disk manifest cache ~5x at negligible decompress
+# cost; plain JSON files are still read (and written) when it is absent.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# msgpack round-trips the parsed component ~5x faster than re-parsing the
+# JSON; cached files fall back to raw JSON bytes when it is absent.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 # For environment variables
 from dotenv import load_dotenv
 
@@ -23,11 +80,8 @@ from bungio.models import (
 )
 from bungio.error import BungieException
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Module logger - configuring handlers/levels is left to the application
+# entry point so importing this module doesn't hijack global logging
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
@@ -40,19 +94,384 @@ OAUTH_AUTH_URL = os.getenv("OAUTH_AUTH_URL")
 OAUTH_TOKEN_URL = os.getenv("OAUTH_TOKEN_URL")
 OAUTH_CALLBACK_URL = os.getenv("OAUTH_CALLBACK_URL")
 
-# Initialize BungIO client
-# Include all required parameters for the BungIO client
-client = Client(
-    bungie_token=BUNGIE_API_KEY,
-    bungie_client_id=OAUTH_CLIENT_ID if OAUTH_CLIENT_ID else "0",  # Must be a string
-    bungie_client_secret=""  # Bungie.net doesn't use client secrets, but the library requires a string
-)
+# BungIO client, created on first use. Building it at import time paid the
+# pydantic model setup cost on every cold start even though the functions
+# here talk to the API with raw aiohttp; only callers that want BungIO's
+# typed models need it.
+_bungio_client: Optional[Client] = None
+
+
+def _get_bungio() -> Client:
+    """Return the lazily-initialized BungIO client."""
+    global _bungio_client
+    if _bungio_client is None:
+        _bungio_client = Client(
+            bungie_token=BUNGIE_API_KEY,
+            bungie_client_id=OAUTH_CLIENT_ID if OAUTH_CLIENT_ID else "0",  # Must be a string
+            bungie_client_secret=""  # Bungie.net doesn't use client secrets, but the library requires a string
+        )
+    return _bungio_client
 
 # Token storage (in a real application, this should be persisted securely)
 access_token = None
 refresh_token = None
 
+# Pre-parsed endpoint URLs and pre-joined query fragments. Wrapping a URL in
+# yarl with encoded=True hands aiohttp a ready-to-send object, skipping the
+# parse/normalize pass it would otherwise run on every request; the constant
+# pieces are only ever computed once at import.
+_MANIFEST_URL = yarl.URL("https://www.bungie.net/Platform/Destiny2/Manifest/", encoded=True)
+_SEARCH_PLAYER_URL = yarl.URL(
+    "https://www.bungie.net/Platform/Destiny2/SearchDestinyPlayerByBungieName/-1/",
+    encoded=True
+)
+_PROFILE_COMPONENTS = (
+    f"{DestinyComponentType.PROFILES.value},"
+    f"{DestinyComponentType.CHARACTERS.value},"
+    f"{DestinyComponentType.CHARACTER_EQUIPMENT.value}"
+)
+_STATS_GROUPS = (
+    f"{DestinyStatsGroupType.GENERAL.value},"
+    f"{DestinyStatsGroupType.WEAPONS.value},"
+    f"{DestinyStatsGroupType.MEDALS.value}"
+)
+
+# Shared HTTP session for direct Bungie API calls. The API key rides along as
+# a default header, and keep-alive pooling lets sequential calls (e.g. the
+# manifest index fetch followed by the component fetch) reuse one TLS
+# connection instead of handshaking for each request.
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared aiohttp session, creating it lazily on first use.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            # Request bodies (the player-search POST) serialize through
+            # orjson when available instead of stdlib json.dumps
+            json_serialize=(lambda obj: orjson.dumps(obj).decode()) if orjson else json.dumps,
+            # A hung request should fail and retry, not wedge the caller
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={
+                "X-API-Key": BUNGIE_API_KEY,
+                "Accept": "application/json",
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "User-Agent": "VanguardViz/1.0 (+https://github.com/BaronVonCaelum/Vanguard_Viz)"
+            },
+            connector=aiohttp.TCPConnector(
+                resolver=aiohttp.AsyncResolver() if _HAS_AIODNS else None,
+                limit=20,
+                limit_per_host=8,
+                use_dns_cache=True,
+                ttl_dns_cache=600,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
+            )
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared session. Call once at application shutdown."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+class BungieRateLimiter:
+    """
+    Token-bucket limiter shared by every request in this module.
+    
+    Bungie throttles bursty clients, and a throttled response costs far
+    more than the pacing that avoids it. The bucket refills at rate
+    tokens per second up to capacity, so short fan-outs (profile plus
+    stats) pass untouched while sustained traffic is smoothed to the
+    target rate.
+    """
+
+    def __init__(self, rate: float = 1.0, capacity: float = 5.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping under the lock until one is available."""
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1.0:
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+                self.last = time.monotonic()
+                self.tokens = 0.0
+            else:
+                self.tokens -= 1.0
+
+
+_rate_limiter = BungieRateLimiter()
+
+# Hard ceiling on concurrent in-flight requests. Each open request holds a
+# socket and its body buffer, so a caller that gathers hundreds of
+# coroutines queues here instead of ballooning memory and the connection
+# pool; the token bucket then paces the ones that get through.
+_REQUEST_SEMAPHORE = asyncio.Semaphore(16)
+
+# Transient Bungie/CDN failures (429 throttles, 5xx, dropped connections,
+# timeouts) are retried with exponential backoff plus jitter. Retrying just
+# the failing request means callers don't redo expensive upstream steps -
+# like re-fetching the manifest index - when only the last hop failed.
+_RETRY_ATTEMPTS = 5
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+async def _request_json(
+    method: str,
+    url: Union[str, yarl.URL],
+    **kwargs: Any
+) -> Dict[str, Any]:
+    """
+    Issue a request on the shared session and return the decoded JSON body.
+    
+    Connection errors, timeouts and retryable HTTP statuses are retried up
+    to _RETRY_ATTEMPTS times with exponential backoff and jitter; the final
+    failure propagates to the caller's error handling.
+    """
+    session = await get_session()
+    delay = 1.0
+    for attempt in range(_RETRY_ATTEMPTS):
+        try:
+            async with _REQUEST_SEMAPHORE:
+                await _rate_limiter.acquire()
+                async with session.request(method, url, **kwargs) as response:
+                    if response.status in _RETRY_STATUSES:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info,
+                            response.history,
+                            status=response.status,
+                            message=response.reason or "",
+                            headers=response.headers
+                        )
+                    return _loads(await response.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == _RETRY_ATTEMPTS - 1:
+                raise
+            # Full jitter keeps a burst of failing callers from retrying in
+            # lockstep against an already-throttling server. When Bungie
+            # says how long to back off, believe it over our own schedule.
+            sleep_for = min(delay, 10.0) * (0.5 + random.random())
+            retry_after = None
+            if isinstance(e, aiohttp.ClientResponseError) and e.headers:
+                retry_after = e.headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    sleep_for = max(sleep_for, float(retry_after))
+                except ValueError:
+                    pass
+            logger.warning(
+                "Retrying %s %s after error: %s (attempt %d/%d)",
+                method, url, e, attempt + 1, _RETRY_ATTEMPTS
+            )
+            await asyncio.sleep(sleep_for)
+            delay *= 2
+
+
+async def _bungie_get(
+    url: Union[str, yarl.URL],
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    GET a Bungie Platform endpoint and return its "Response" payload.
+    
+    Rides _request_json, so every caller gets the shared session, token
+    bucket, retry/backoff and orjson parsing in one place; an envelope
+    without a Response (error replies) comes back as an empty dict.
+    Query parameters go through aiohttp's params= so they are encoded
+    once, correctly, instead of hand-joined into the URL.
+    """
+    reply = await _request_json("GET", url, params=params)
+    return reply.get("Response", {})
+
+
+# Manifest index single-flight cache. test_api_connection and
+# get_manifest_component both need the index, so concurrent callers share
+# one in-flight request and the result stays fresh for six hours.
+_MANIFEST_INDEX_TTL = 6 * 3600
+_manifest_index_task: Optional["asyncio.Future[Dict[str, Any]]"] = None
+_manifest_index_expiry: float = 0.0
+
+
+async def _get_manifest_index() -> Dict[str, Any]:
+    """
+    Return the manifest index "Response" dict, or a dict with an "error" key.
+    Failures are not cached, so the next caller retries.
+    
+    When the TTL lapses with a good index in hand, the stale index is
+    returned immediately and the refresh runs in the background - a bet
+    that the version has not changed. Component caching is keyed by
+    version, so losing the bet costs one extra component fetch on a later
+    call rather than serving wrong data.
+    """
+    global _manifest_index_task, _manifest_index_expiry
+    now = time.monotonic()
+    if _manifest_index_task is None:
+        _manifest_index_task = asyncio.ensure_future(_request_manifest_index())
+        _manifest_index_expiry = now + _MANIFEST_INDEX_TTL
+    elif _manifest_index_task.done() and now >= _manifest_index_expiry:
+        stale = None
+        if not _manifest_index_task.cancelled() and _manifest_index_task.exception() is None:
+            stale = _manifest_index_task.result()
+        _manifest_index_task = asyncio.ensure_future(_request_manifest_index())
+        _manifest_index_expiry = now + _MANIFEST_INDEX_TTL
+        if stale is not None and "error" not in stale:
+            return stale
+    task = _manifest_index_task
+    try:
+        manifest_data = await task
+    except BaseException:
+        # A raised exception (DNS failure, reset, timeout) must not sit
+        # in the future for the whole TTL; drop it so the next caller
+        # retries, unless a newer refresh has already replaced it
+        if _manifest_index_task is task:
+            _manifest_index_task = None
+        raise
+    if "error" in manifest_data and _manifest_index_task is task:
+        _manifest_index_task = None
+    return manifest_data
+
+
+# Conditional-request state for the index: replaying the last ETag turns
+# an unchanged refresh into a bodyless 304, skipping download and reparse.
+_index_etag: Optional[str] = None
+_index_last_good: Optional[Dict[str, Any]] = None
+
+
+async def _request_manifest_index() -> Dict[str, Any]:
+    """Issue the actual manifest index request, revalidating by ETag."""
+    global _index_etag, _index_last_good
+    session = await get_session()
+    headers = {"If-None-Match": _index_etag} if _index_etag else None
+    async with _REQUEST_SEMAPHORE:
+        await _rate_limiter.acquire()
+        async with session.get(_MANIFEST_URL, headers=headers) as response:
+            if response.status == 304 and _index_last_good is not None:
+                return _index_last_good
+            etag = response.headers.get("ETag")
+            raw = await response.read()
+    manifest_response = _loads(raw)
+    if "Response" not in manifest_response:
+        logger.error("Failed to get manifest: %s", manifest_response.get('Message', 'Unknown error'))
+        return {"error": "Failed to retrieve Destiny 2 manifest"}
+    _index_etag = etag
+    _index_last_good = manifest_response.get("Response", {})
+    return _index_last_good
+
+
+# Profile and stats answers only move on the scale of minutes, so repeat
+# dashboard refreshes inside the TTL are served from memory and concurrent
+# misses for the same player coalesce onto a single in-flight request.
+_RESULT_CACHE_TTL = 60.0
+
+
+def _ttl_cached(ttl: float):
+    """
+    Cache an async function's result per argument tuple for ttl seconds.
+    
+    The future is stored before it is awaited, so concurrent callers with
+    the same key share one request instead of stampeding the API. Error
+    results and raised exceptions are evicted rather than cached.
+    """
+    def decorator(func):
+        cache: Dict[Tuple[Any, ...], Tuple[float, "asyncio.Future"]] = {}
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            key = args + tuple(sorted(kwargs.items())) if kwargs else args
+            entry = cache.get(key)
+            if entry is not None and (not entry[1].done() or time.monotonic() < entry[0]):
+                result = await entry[1]
+                if "error" not in result:
+                    return result
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            cache[key] = (time.monotonic() + ttl, future)
+            try:
+                result = await future
+            except Exception:
+                cache.pop(key, None)
+                raise
+            if "error" in result:
+                cache.pop(key, None)
+            return result
+        return wrapper
+    return decorator
+
 
+# Bungie name -> membership mapping. Names change rarely, so entries live
+# for the process lifetime and repeat profile lookups skip the search POST
+# entirely; get_user_profile evicts an entry when its profile turns out to
+# be gone (the player renamed).
+_membership_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+
+async def _search_player(bungie_name: str, bungie_code: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a player's membership by Bungie name and code.
+    
+    Returns the first matching membership dict, or None if no player was found.
+    Splitting this out of get_user_profile lets callers learn the membership
+    first and then issue the dependent profile/stats requests concurrently.
+    Resolved memberships are remembered so only the first lookup for a name
+    pays the search round-trip.
+    """
+    cached = _membership_cache.get((bungie_name, bungie_code))
+    if cached is not None:
+        return cached
+    
+    search_payload = {
+        "displayName": bungie_name,
+        "displayNameCode": bungie_code
+    }
+    
+    # The API key is already a default header on the shared session
+    user_search_response = await _request_json("POST", _SEARCH_PLAYER_URL, json=search_payload)
+    
+    # Get the first membership from the search results
+    search_results = user_search_response.get("Response", []) if user_search_response else []
+    if not search_results:
+        logger.error("No user found with Bungie name: %s#%s", bungie_name, bungie_code)
+        return None
+    
+    membership = search_results[0]
+    _membership_cache[(bungie_name, bungie_code)] = membership
+    return membership
+
+
+async def fetch_profile_components(membership: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fetch the profile, characters and equipment components for a membership.
+    
+    Args:
+        membership: A membership dict as returned by _search_player
+        
+    Returns:
+        The "Response" portion of the profile reply
+    """
+    # The components query string is precomputed at module scope
+    url = yarl.URL(
+        f"https://www.bungie.net/Platform/Destiny2/{membership['membershipType']}"
+        f"/Profile/{membership['membershipId']}/?components={_PROFILE_COMPONENTS}",
+        encoded=True
+    )
+    
+    return await _bungie_get(url)
+
+
+@_ttl_cached(_RESULT_CACHE_TTL)
 async def get_user_profile(bungie_name: str, bungie_code: str) -> Dict[str, Any]:
     """
     Get a user's Destiny 2 profile information by Bungie name and code.
@@ -66,69 +485,51 @@ async def get_user_profile(bungie_name: str, bungie_code: str) -> Dict[str, Any]
     """
     try:
         # Search for the user by their Bungie name and code
-        search_payload = {
-            "displayName": bungie_name,
-            "displayNameCode": bungie_code
-        }
-        
-        # Access the Bungie API directly
-        url = "https://www.bungie.net/Platform/Destiny2/SearchDestinyPlayerByBungieName/-1/"
-        headers = {
-            "X-API-Key": BUNGIE_API_KEY,
-            "Content-Type": "application/json"
-        }
-        
-        # Create a new session for the request
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=search_payload, headers=headers) as response:
-                user_search_response = await response.json()
-        
-        if not user_search_response or not user_search_response.get("Response"):
-            logger.error(f"No user found with Bungie name: {bungie_name}#{bungie_code}")
+        membership = await _search_player(bungie_name, bungie_code)
+        if membership is None:
             return {"error": "User not found"}
         
-        # Get the first membership from the search results
-        search_results = user_search_response.get("Response", [])
-        if not search_results:
-            logger.error(f"Empty search results for Bungie name: {bungie_name}#{bungie_code}")
-            return {"error": "User not found"}
-            
-        # Get the first result
-        membership = search_results[0]
-        
         # Get the user's profile
-        components = [
-            DestinyComponentType.PROFILES.value, 
-            DestinyComponentType.CHARACTERS.value, 
-            DestinyComponentType.CHARACTER_EQUIPMENT.value
-        ]
-        
-        # Build the URL for profile request
-        components_str = ",".join(str(c) for c in components)
-        url = f"https://www.bungie.net/Platform/Destiny2/{membership['membershipType']}/Profile/{membership['membershipId']}/?components={components_str}"
-        headers = {
-            "X-API-Key": BUNGIE_API_KEY
-        }
-        
-        # Create a new session for the request
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                profile_response = await response.json()
+        profile = await fetch_profile_components(membership)
+        if not profile and _membership_cache.pop((bungie_name, bungie_code), None) is not None:
+            # The cached membership went stale (player renamed or moved
+            # platforms) - resolve it fresh and try the profile once more
+            membership = await _search_player(bungie_name, bungie_code)
+            if membership is None:
+                return {"error": "User not found"}
+            profile = await fetch_profile_components(membership)
         
         return {
-            "profile": profile_response.get("Response", {}),
+            "profile": profile,
             "membership": membership
         }
     
     except BungieException as e:
-        logger.error(f"Bungie API error: {e}")
+        logger.error("Bungie API error: %s", e)
         return {"error": f"Bungie API error: {e}"}
     
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         return {"error": f"Unexpected error: {e}"}
 
 
+async def get_user_profiles_bulk(
+    identities: List[Tuple[str, str]]
+) -> List[Dict[str, Any]]:
+    """
+    Fetch profiles for several (bungie_name, bungie_code) pairs at once.
+    
+    The lookups run concurrently over the shared session and rate
+    limiter, and the TTL cache coalesces duplicate identities, so a
+    dashboard resolving N players pays for the distinct ones only.
+    Results come back in input order.
+    """
+    return await asyncio.gather(
+        *(get_user_profile(name, code) for name, code in identities)
+    )
+
+
+@_ttl_cached(_RESULT_CACHE_TTL)
 async def get_player_stats(
     membership_type: int, 
     destiny_membership_id: str,
@@ -148,164 +549,470 @@ async def get_player_stats(
         Dict containing player stats
     """
     try:
-        # Define the groups we want to retrieve
-        groups = [
-            DestinyStatsGroupType.GENERAL.value,
-            DestinyStatsGroupType.WEAPONS.value,
-            DestinyStatsGroupType.MEDALS.value
-        ]
-        
-        # Build the URL for stats request
-        groups_str = ",".join(str(g) for g in groups)
-        
-        # Add date parameters if specified
+        # Add date parameters if specified; the groups string is precomputed
         date_params = ""
         if start_date:
             date_params += f"&daystart={start_date.strftime('%Y-%m-%d')}"
         if end_date:
             date_params += f"&dayend={end_date.strftime('%Y-%m-%d')}"
             
-        url = f"https://www.bungie.net/Platform/Destiny2/{membership_type}/Account/{destiny_membership_id}/Stats/?groups={groups_str}{date_params}"
-        headers = {
-            "X-API-Key": BUNGIE_API_KEY
-        }
+        url = yarl.URL(
+            f"https://www.bungie.net/Platform/Destiny2/{membership_type}/Account"
+            f"/{destiny_membership_id}/Stats/?groups={_STATS_GROUPS}{date_params}",
+            encoded=True
+        )
         
-        # Create a new session for the request
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                stats_response = await response.json()
-        
-        return stats_response.get("Response", {})
+        return await _bungie_get(url)
     
     except BungieException as e:
-        logger.error(f"Bungie API error: {e}")
+        logger.error("Bungie API error: %s", e)
         return {"error": f"Bungie API error: {e}"}
     
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         return {"error": f"Unexpected error: {e}"}
 
 
 async def test_api_connection() -> Dict[str, Any]:
     """
-    Test the API connection by fetching the Destiny 2 manifest.
-    
+    Test the API connection with a HEAD request against the manifest endpoint.
+
     Returns:
-        Dict indicating connection status and version information
+        Dict indicating connection status
     """
     try:
-        # Attempt to get the Destiny 2 manifest using direct HTTP request
-        url = "https://www.bungie.net/Platform/Destiny2/Manifest/"
-        headers = {
-            "X-API-Key": BUNGIE_API_KEY
-        }
+        # A HEAD probe proves connectivity and auth without downloading or
+        # parsing the manifest body. Callers that need the version string
+        # get it from get_manifest_version() instead.
+        session = await get_session()
+        async with session.head(_MANIFEST_URL) as response:
+            status = response.status
         
-        # Create a new session for the request
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                manifest_response = await response.json()
-        
-        if manifest_response and "Response" in manifest_response:
+        if status == 200:
             return {
                 "status": "connected",
-                "version": manifest_response.get("Response", {}).get("version", "unknown"),
                 "message": "Successfully connected to Bungie API"
             }
         else:
             return {
                 "status": "error",
-                "message": "Connected but received empty response"
+                "message": f"Connected but received HTTP {status}"
             }
     
     except BungieException as e:
-        logger.error(f"Bungie API error during connection test: {e}")
+        logger.error("Bungie API error during connection test: %s", e)
         return {
             "status": "error",
             "message": f"API connection failed: {e}"
         }
     
     except Exception as e:
-        logger.error(f"Unexpected error during connection test: {e}")
+        logger.error("Unexpected error during connection test: %s", e)
         return {
             "status": "error",
             "message": f"Unexpected error: {e}"
         }
 
 
-async def get_manifest_component(component_type: str = "DestinyInventoryItemDefinition") -> Dict[str, Any]:
+# Parsed manifest components, cached per manifest version. A component is
+# immutable until Bungie bumps the version, so warm calls skip the
+# tens-of-MB download and parse entirely. The disk cache shares
+# manifest_helper's plain-JSON file layout, and the lock single-flights
+# concurrent cold callers so only one pays the download.
+_CACHE_DIR = Path("~/.cache/vanguard_viz").expanduser()
+_component_cache: Dict[Tuple[str, str, Optional[Tuple[str, ...]]], Dict[str, Any]] = {}
+_component_lock = asyncio.Lock()
+
+
+def _iter_entries(component_data: Any, filter_keys: Optional[frozenset]) -> Any:
+    """Yield (hash, entry) pairs, restricted to filter_keys when given."""
+    if filter_keys is None:
+        return component_data.items()
+
+    def filtered():
+        for key in filter_keys:
+            try:
+                yield key, component_data[key]
+            except KeyError:
+                continue
+    return filtered()
+
+
+def _project_fields(
+    component_data: Any,
+    fields: Tuple[str, ...],
+    filter_keys: Optional[frozenset] = None
+) -> Dict[str, Any]:
+    """
+    Materialize only the given dot-separated field paths for each entry.
+    Works over a plain dict or a lazy simdjson document; with the latter,
+    sub-objects outside the projection are never built as Python objects.
+    A filter_keys set restricts the output to those entry hashes.
+    """
+    paths = [field.split(".") for field in fields]
+    slim: Dict[str, Any] = {}
+    for entry_hash, entry in _iter_entries(component_data, filter_keys):
+        slim_entry: Dict[str, Any] = {}
+        for parts in paths:
+            value = entry
+            for part in parts:
+                try:
+                    value = value[part]
+                except (KeyError, TypeError):
+                    value = None
+                    break
+            if value is not None:
+                target = slim_entry
+                for part in parts[:-1]:
+                    target = target.setdefault(part, {})
+                target[parts[-1]] = value
+        slim[entry_hash] = slim_entry
+    return slim
+
+
+def _parse_component(
+    raw_bytes: bytes,
+    fields: Optional[Tuple[str, ...]],
+    filter_keys: Optional[frozenset] = None
+) -> Any:
+    """
+    Parse component bytes, projecting to the requested fields and
+    restricting to the requested entry hashes when either is given.
+    Accepts JSON or msgpack payloads, told apart by the leading byte.
+    """
+    if raw_bytes[:1] not in (b"{", b"["):
+        # msgpack-cached payload (same sniff manifest_helper uses)
+        if msgpack is None:
+            raise RuntimeError("msgpack payload in cache but msgpack is not installed")
+        data = msgpack.unpackb(bytes(raw_bytes))
+        if filter_keys is not None:
+            data = {key: data[key] for key in filter_keys if key in data}
+        if fields:
+            return _project_fields(data, fields)
+        return data
+    if fields:
+        if simdjson:
+            # Lazy parse: only the projected paths allocate Python objects
+            return _project_fields(simdjson.Parser().parse(raw_bytes), fields, filter_keys)
+        return _project_fields(_loads(raw_bytes), fields, filter_keys)
+    data = _loads(raw_bytes)
+    if filter_keys is not None:
+        return {key: data[key] for key in filter_keys if key in data}
+    return data
+
+
+# Cache read preference: msgpack decodes fastest, compressed beats plain.
+# Later suffixes cover files written by older builds or leaner installs.
+_CACHE_SUFFIXES = (".mp.zst", ".mp", ".json.zst", ".json")
+
+
+def _read_component_cache(component_type: str, version: str) -> Optional[bytes]:
+    """
+    Return cached payload bytes (msgpack or JSON) for a component, or
+    None on a miss. _parse_component sniffs the format from the bytes.
+    """
+    for suffix in _CACHE_SUFFIXES:
+        if suffix.startswith(".mp") and msgpack is None:
+            continue
+        path = _CACHE_DIR / f"{component_type}-{version}{suffix}"
+        try:
+            payload = path.read_bytes()
+        except OSError:
+            continue
+        if suffix.endswith(".zst"):
+            if not zstandard:
+                continue
+            try:
+                payload = zstandard.ZstdDecompressor().decompress(payload)
+            except zstandard.ZstdError:
+                continue
+        return payload
+    return None
+
+
+def _write_component_cache(
+    component_type: str,
+    version: str,
+    raw_bytes: bytes,
+    component_data: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Persist a component, evicting older versions. When the fully parsed
+    dict is provided and msgpack is installed the cache stores msgpack,
+    which later loads skip the JSON reparse for; otherwise the raw JSON
+    bytes are written as-is.
+    """
+    try:
+        if msgpack and component_data is not None:
+            suffix = ".mp"
+            payload = msgpack.packb(component_data)
+        else:
+            suffix = ".json"
+            payload = bytes(raw_bytes)
+        if zstandard:
+            suffix += ".zst"
+            payload = zstandard.ZstdCompressor(level=3).compress(payload)
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _CACHE_DIR / f"{component_type}-{version}{suffix}"
+        # Temp-file-and-rename so readers never see partial data
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_bytes(payload)
+        tmp_path.replace(path)
+        for stale in _CACHE_DIR.glob(f"{component_type}-*"):
+            if stale != path and not stale.name.endswith(".tmp"):
+                stale.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Could not write manifest cache for %s: %s", component_type, e)
+
+
+def _stale_component(
+    component_type: str,
+    fields: Optional[Tuple[str, ...]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Return a previously cached result for the component from any manifest
+    version, or None. Old versions are only evicted after a newer fetch
+    succeeds, so an entry found here is the last known good copy - better
+    to serve a slightly dated definition set than to fail the caller
+    because Bungie is briefly unreachable.
+    """
+    for (cached_type, _, cached_fields), result in _component_cache.items():
+        if cached_type == component_type and cached_fields == fields:
+            return result
+    return None
+
+
+async def get_manifest_version() -> str:
+    """
+    Return the current Destiny 2 manifest version.
+    
+    Backed by the cached manifest index, so repeat calls within the TTL
+    don't touch the network.
+    """
+    manifest_data = await _get_manifest_index()
+    return manifest_data.get("version", "unknown")
+
+
+async def get_manifest_component(
+    component_type: str = "DestinyInventoryItemDefinition",
+    fields: Optional[Tuple[str, ...]] = None,
+    filter_keys: Optional[frozenset] = None
+) -> Dict[str, Any]:
     """
     Retrieves a specific component from the Destiny 2 Manifest.
     
     Args:
         component_type: The manifest component to retrieve. Default is "DestinyInventoryItemDefinition".
                        Other examples include "DestinyClassDefinition", "DestinySandboxPerkDefinition", etc.
+        fields: Optional dot-separated field paths. When given, componentData
+                holds only those fields per entry; with pysimdjson installed
+                the rest of the multi-MB document is never materialized.
+        filter_keys: Optional set of entry hashes; when given, componentData
+                holds only those entries. Such subsets vary per caller, so
+                they skip the in-memory cache (the raw download is still
+                cached on disk by version).
         
     Returns:
         Dict containing the requested manifest component data
     """
+    if fields is not None:
+        fields = tuple(fields)
+    if filter_keys is not None:
+        filter_keys = frozenset(str(key) for key in filter_keys)
+    
     try:
-        # Step 1: Get the manifest
-        manifest_url = "https://www.bungie.net/Platform/Destiny2/Manifest/"
-        headers = {
-            "X-API-Key": BUNGIE_API_KEY
-        }
-        
-        # Make request to get the manifest paths
-        async with aiohttp.ClientSession() as session:
-            async with session.get(manifest_url, headers=headers) as response:
-                manifest_response = await response.json()
-                if response.status != 200 or "Response" not in manifest_response:
-                    logger.error(f"Failed to get manifest: {manifest_response.get('Message', 'Unknown error')}")
-                    return {"error": "Failed to retrieve Destiny 2 manifest"}
-                
-                manifest_data = manifest_response.get("Response", {})
+        # Step 1: Get the manifest index (shared with test_api_connection)
+        manifest_data = await _get_manifest_index()
+        if "error" in manifest_data:
+            stale = _stale_component(component_type, fields)
+            if stale is not None:
+                logger.warning("Manifest index unavailable; serving cached %s", component_type)
+                return stale
+            return {"error": "Failed to retrieve Destiny 2 manifest"}
+        session = await get_session()
         
         # Step 2: Extract the path for the requested component
-        if "jsonWorldComponentContentPaths" not in manifest_data or "en" not in manifest_data["jsonWorldComponentContentPaths"]:
+        content_paths = manifest_data.get("jsonWorldComponentContentPaths", {}).get("en")
+        if content_paths is None:
             logger.error("Manifest data does not contain jsonWorldComponentContentPaths or language data")
             return {"error": "Invalid manifest data structure"}
-            
-        content_paths = manifest_data["jsonWorldComponentContentPaths"]["en"]
         if component_type not in content_paths:
-            logger.error(f"Component type {component_type} not found in manifest")
+            logger.error("Component type %s not found in manifest", component_type)
             return {"error": f"Component type {component_type} not found in manifest"}
             
         component_path = content_paths[component_type]
         
-        # Step 3: Construct the full URL
-        component_url = f"https://www.bungie.net{component_path}"
+        # Step 3: Check the version-keyed caches - the component only
+        # changes when the manifest version does
+        version = manifest_data.get("version", "")
+        cache_key = (component_type, version, fields)
+        if version and filter_keys is None:
+            cached = _component_cache.get(cache_key)
+            if cached is not None:
+                return cached
         
         # Step 4: Make second call to get the actual definitions
-        logger.info(f"Fetching manifest component: {component_type}")
+        logger.info("Fetching manifest component: %s", component_type)
         try:
-            async with aiohttp.ClientSession() as session:
+            async with _component_lock:
+                # A concurrent caller may have filled the cache while we
+                # waited on the lock
+                if version:
+                    if filter_keys is None:
+                        cached = _component_cache.get(cache_key)
+                        if cached is not None:
+                            return cached
+                    
+                    cached_bytes = _read_component_cache(component_type, version)
+                    if cached_bytes is not None:
+                        logger.info("Using disk-cached %s for version %s", component_type, version)
+                        result = {
+                            "status": "success",
+                            "componentType": component_type,
+                            "componentData": await asyncio.to_thread(
+                                _parse_component, cached_bytes, fields, filter_keys
+                            )
+                        }
+                        if filter_keys is None:
+                            _component_cache[cache_key] = result
+                        return result
+                
+                component_url = f"https://www.bungie.net{component_path}"
+                # Same pooled connection as the manifest index call above
                 async with session.get(component_url) as response:
                     if response.status != 200:
-                        logger.error(f"Failed to get component data: {response.status}")
+                        logger.error("Failed to get component data: %s", response.status)
+                        stale = _stale_component(component_type, fields)
+                        if stale is not None:
+                            logger.warning("Serving cached %s after HTTP %s", component_type, response.status)
+                            return stale
                         return {"error": f"Failed to retrieve component data: {response.status}"}
-                    
-                    # Parse the response - can be large so we handle with care
-                    component_data = await response.json()
-                    
-                    logger.info(f"Successfully retrieved {component_type} with {len(component_data)} entries")
-                    return {
-                        "status": "success",
-                        "componentType": component_type,
-                        "componentData": component_data
-                    }
+
+                    # Stream the decompressed body into one growable buffer
+                    # instead of letting read() accumulate a chunk list and
+                    # join it - that join doubles peak memory for a payload
+                    # this size. The bytearray feeds the parser directly
+                    # without a final bytes() copy.
+                    buf = bytearray()
+                    async for chunk in response.content.iter_chunked(1 << 16):
+                        buf.extend(chunk)
+                    raw_bytes = buf
+
+                    # Parse - can be large so we handle with care. Decode on
+                    # a worker thread so the multi-MB parse doesn't stall
+                    # other coroutines on the event loop.
+                    component_data = await asyncio.to_thread(
+                        _parse_component, raw_bytes, fields, filter_keys
+                    )
+
+                logger.info("Successfully retrieved %s with %s entries", component_type, len(component_data))
+                result = {
+                    "status": "success",
+                    "componentType": component_type,
+                    "componentData": component_data
+                }
+                if version:
+                    # The parsed dict is only complete (and so only cached
+                    # as msgpack) when no projection or filter was applied
+                    _write_component_cache(
+                        component_type, version, raw_bytes,
+                        component_data if not fields and filter_keys is None else None
+                    )
+                    if filter_keys is None:
+                        # Evict entries for older manifest versions
+                        for key in [k for k in _component_cache if k[0] == component_type and k[1] != version]:
+                            del _component_cache[key]
+                        _component_cache[cache_key] = result
+                return result
         except Exception as e:
-            logger.error(f"Error fetching component data: {e}")
+            logger.error("Error fetching component data: %s", e)
+            stale = _stale_component(component_type, fields)
+            if stale is not None:
+                logger.warning("Serving cached %s after fetch error", component_type)
+                return stale
             return {"error": f"Failed to retrieve or parse component data: {e}"}
     
     except BungieException as e:
-        logger.error(f"Bungie API error: {e}")
+        logger.error("Bungie API error: %s", e)
         return {"error": f"Bungie API error: {e}"}
     
     except Exception as e:
-        logger.error(f"Unexpected error retrieving manifest component: {e}")
+        logger.error("Unexpected error retrieving manifest component: %s", e)
         return {"error": f"Unexpected error: {e}"}
 
 
+async def chunked_iter_component(
+    component_type: str,
+    chunk_size: int = 4096,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> AsyncIterator[List[Tuple[str, Dict[str, Any]]]]:
+    """
+    Iterate a manifest component as batches of (hash, definition) pairs.
+    
+    Fetches the component through get_manifest_component (so the version
+    caches still apply) and yields lists of chunk_size entries at a time.
+    Consumers doing per-item enrichment work chunk-at-a-time instead of
+    walking all 30k+ entries in one pass, and the event loop gets control
+    back between chunks so concurrent requests aren't starved.
+    
+    Args:
+        component_type: The manifest component to iterate
+        chunk_size: Number of (hash, definition) pairs per yielded batch
+        fields: Optional field projection, as for get_manifest_component
+        
+    Yields:
+        Lists of (hash, definition) tuples, chunk_size long except the last
+    """
+    result = await get_manifest_component(component_type, fields=fields)
+    if result.get("status") != "success":
+        logger.warning(
+            "Cannot iterate %s: %s",
+            component_type, result.get("error", "Unknown error"),
+        )
+        return
+    entries = iter(result.get("componentData", {}).items())
+    while batch := list(itertools.islice(entries, chunk_size)):
+        yield batch
+        # Yield the loop between chunks; the batches themselves are
+        # processed synchronously by the caller
+        await asyncio.sleep(0)
+
+
+# The only definition fields the weapon merge reads - projecting to these
+# skips materializing ~95% of the item-definitions document
+_WEAPON_DEF_FIELDS = (
+    "displayProperties.name",
+    "displayProperties.icon",
+    "itemTypeDisplayName",
+    "inventory.tierType",
+    "defaultDamageType"
+)
+
+
+def _weapon_meta(item_def: Dict[str, Any]) -> Tuple[str, str, str, int, int]:
+    """Flatten a projected item definition to the five fields the merge reads."""
+    display = item_def.get("displayProperties") or {}
+    return (
+        display.get("name", "Unknown Weapon"),
+        display.get("icon", ""),
+        item_def.get("itemTypeDisplayName", "Unknown"),
+        (item_def.get("inventory") or {}).get("tierType", 0),
+        item_def.get("defaultDamageType", 0)
+    )
+
+
+def _basic(values: Dict[str, Any], key: str) -> Any:
+    """
+    Return values[key]["basic"]["value"], or 0 when any level is missing.
+    One try/except replaces three chained .get() calls and their throwaway
+    {} default allocations per stat.
+    """
+    try:
+        return values[key]["basic"]["value"]
+    except (KeyError, TypeError):
+        return 0
+
+
 async def get_weapon_usage_stats(
     membership_type: int, 
     destiny_membership_id: str, 
@@ -327,106 +1034,120 @@ async def get_weapon_usage_stats(
         Dict containing detailed weapon usage statistics with metadata
     """
     try:
-        # Step 1: Get unique weapons data for the character
+        # The unique-weapons and manifest requests are independent, so
+        # overlap them; wall time becomes the manifest chain (index then
+        # definitions) rather than the sum of the round-trips. Both ride
+        # the shared keep-alive session.
         unique_weapons_url = f"https://www.bungie.net/Platform/Destiny2/{membership_type}/Account/{destiny_membership_id}/Character/{character_id}/Stats/UniqueWeapons/"
-        headers = {
-            "X-API-Key": BUNGIE_API_KEY
-        }
-        
-        # Create session for unique weapons request
-        unique_weapons_data = {}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(unique_weapons_url, headers=headers) as response:
-                unique_weapons_response = await response.json()
-                if response.status == 200 and "Response" in unique_weapons_response:
-                    unique_weapons_data = unique_weapons_response.get("Response", {})
-        
-        # Step 2: Get historical stats for the account to supplement weapon data
-        historical_stats_url = f"https://www.bungie.net/Platform/Destiny2/{membership_type}/Account/{destiny_membership_id}/Stats/"
-        historical_stats_data = {}
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(historical_stats_url, headers=headers) as response:
-                historical_stats_response = await response.json()
-                if response.status == 200 and "Response" in historical_stats_response:
-                    historical_stats_data = historical_stats_response.get("Response", {})
         
-        # Step 3: Get weapon definitions from the manifest
-        # Get item definitions using our new method
-        item_definitions_response = await get_manifest_component("DestinyInventoryItemDefinition")
+        unique_weapons_data, item_definitions_response = await asyncio.gather(
+            _bungie_get(unique_weapons_url),
+            get_manifest_component("DestinyInventoryItemDefinition", fields=_WEAPON_DEF_FIELDS),
+            return_exceptions=True
+        )
+        if isinstance(unique_weapons_data, BaseException):
+            # Nothing to merge without the stats themselves
+            raise unique_weapons_data
+        if isinstance(item_definitions_response, BaseException):
+            # Stats without display names beat no stats at all
+            logger.warning("Item definitions fetch failed: %s", item_definitions_response)
+            item_definitions_response = {"error": str(item_definitions_response)}
         
         # Extract the item definitions if successful
         item_definitions = {}
-        if "status" in item_definitions_response and item_definitions_response["status"] == "success":
+        if item_definitions_response.get("status") == "success":
             item_definitions = item_definitions_response.get("componentData", {})
         else:
-            logger.warning(f"Failed to retrieve item definitions: {item_definitions_response.get('error', 'Unknown error')}")
+            logger.warning("Failed to retrieve item definitions: %s", item_definitions_response.get('error', 'Unknown error'))
             # We'll proceed without item definitions if there's an issue
         
-        # Step 4: Process the data and merge weapon stats with metadata
-        weapon_stats = []
+        # Keep only the entries for weapons this account actually used -
+        # a couple hundred hashes versus the 30k+ in the component. The big
+        # dict reference is dropped here so this request stops pinning it.
+        if item_definitions:
+            needed = {
+                weapon.get("referenceId", 0)
+                for weapon in unique_weapons_data.get("weapons", [])
+            }
+            # JSON object keys arrive as strings; re-key the survivors by
+            # int so the merge loop indexes with referenceId as-is instead
+            # of allocating a str per row, and flatten each definition to
+            # the five-field tuple the merge reads so the nested-dict walk
+            # happens once per hash rather than once per row.
+            item_definitions = {
+                rid: _weapon_meta(item_definitions[key])
+                for rid in needed if (key := str(rid)) in item_definitions
+            }
+        
+        # Step 4: Process the data and merge weapon stats with metadata.
+        # Columns are built as parallel lists (one list per field) instead
+        # of a list of per-weapon dicts - key strings are stored once per
+        # column rather than once per row, which shrinks the serialized
+        # payload and matches how the Tableau connector ingests the data.
+        # The three integer stat columns live in array('q') while building
+        # to avoid boxing every count; Bungie serializes basic.value as a
+        # double, so the counts are coerced through int() on the way in
+        # (array('q') rejects float).
+        ref_ids: List[str] = []
+        names: List[str] = []
+        types: List[str] = []
+        icons: List[str] = []
+        kills = array("q")
+        precision_kills = array("q")
+        usage_times = array("q")
+        tier_types = array("q")
+        damage_types = array("q")
         
         # Process unique weapons data
-        if "weapons" in unique_weapons_data:
-            for weapon in unique_weapons_data["weapons"]:
-                weapon_hash = str(weapon.get("referenceId", "0"))
-                weapon_data = {
-                    "referenceId": weapon_hash,
-                    "weaponName": "Unknown Weapon",
-                    "weaponType": "Unknown",
-                    "weaponIcon": "",
-                    "killCount": 0,
-                    "precisionKillCount": 0,
-                    "usageTime": 0,
-                    "activityType": "All",
-                }
-                
-                # Add basic stats from unique weapons
-                values = weapon.get("values", {})
-                weapon_data["killCount"] = values.get("uniqueWeaponKills", {}).get("basic", {}).get("value", 0)
-                weapon_data["precisionKillCount"] = values.get("uniqueWeaponPrecisionKills", {}).get("basic", {}).get("value", 0)
-                weapon_data["usageTime"] = values.get("uniqueWeaponTimeUsed", {}).get("basic", {}).get("value", 0)
-                
-                # Add metadata from manifest if available
-                if weapon_hash in item_definitions:
-                    item_def = item_definitions[weapon_hash]
-                    weapon_data["weaponName"] = item_def.get("displayProperties", {}).get("name", "Unknown Weapon")
-                    weapon_data["weaponType"] = item_def.get("itemTypeDisplayName", "Unknown")
-                    weapon_data["weaponIcon"] = item_def.get("displayProperties", {}).get("icon", "")
-                    weapon_data["tierType"] = item_def.get("inventory", {}).get("tierType", 0)
-                    weapon_data["damageType"] = item_def.get("defaultDamageType", 0)
-                
-                weapon_stats.append(weapon_data)
-        
-        # Add PvE/PvP split if available from historical stats
-        if historical_stats_data:
-            # Process PvE weapon stats
-            if "allPvE" in historical_stats_data and "allTime" in historical_stats_data["allPvE"]:
-                pve_stats = historical_stats_data["allPvE"]["allTime"]
-                if "weaponKillsPrecisionKills" in pve_stats:
-                    pve_weapon_stats = pve_stats["weaponKillsPrecisionKills"].get("statId", {})
-                    # Could add more detailed PvE weapon stats here
+        for weapon in unique_weapons_data.get("weapons", []):
+            reference_id = weapon.get("referenceId", 0)
+            values = weapon.get("values", {})
+            
+            ref_ids.append(str(reference_id))
+            kills.append(int(_basic(values, "uniqueWeaponKills")))
+            precision_kills.append(int(_basic(values, "uniqueWeaponPrecisionKills")))
+            usage_times.append(int(_basic(values, "uniqueWeaponTimeUsed")))
             
-            # Process PvP weapon stats
-            if "allPvP" in historical_stats_data and "allTime" in historical_stats_data["allPvP"]:
-                pvp_stats = historical_stats_data["allPvP"]["allTime"]
-                if "weaponKillsPrecisionKills" in pvp_stats:
-                    pvp_weapon_stats = pvp_stats["weaponKillsPrecisionKills"].get("statId", {})
-                    # Could add more detailed PvP weapon stats here
-        
-        # Return combined data
+            # Add metadata from manifest if available
+            meta = item_definitions.get(reference_id)
+            if meta is not None:
+                name, icon, type_name, tier, damage = meta
+                names.append(name)
+                types.append(type_name)
+                icons.append(icon)
+                tier_types.append(tier)
+                damage_types.append(damage)
+            else:
+                names.append("Unknown Weapon")
+                types.append("Unknown")
+                icons.append("")
+                tier_types.append(0)
+                damage_types.append(0)
+    
+        # Return combined data in columnar form
         return {
             "status": "success",
-            "weaponStats": weapon_stats,
-            "totalWeapons": len(weapon_stats)
+            "columns": {
+                "referenceId": ref_ids,
+                "weaponName": names,
+                "weaponType": types,
+                "weaponIcon": icons,
+                "killCount": list(kills),
+                "precisionKillCount": list(precision_kills),
+                "usageTime": list(usage_times),
+                "tierType": list(tier_types),
+                "damageType": list(damage_types),
+                "activityType": ["All"] * len(ref_ids),
+            },
+            "totalWeapons": len(ref_ids)
         }
     
     except BungieException as e:
-        logger.error(f"Bungie API error getting weapon stats: {e}")
+        logger.error("Bungie API error getting weapon stats: %s", e)
         return {"error": f"Bungie API error: {e}"}
     
     except Exception as e:
-        logger.error(f"Unexpected error getting weapon stats: {e}")
+        logger.error("Unexpected error getting weapon stats: %s", e)
         return {"error": f"Unexpected error: {e}"}
 
 
@@ -460,47 +1181,30 @@ async def get_activity_history(
         # Build the URL for activity history request
         url = f"https://www.bungie.net/Platform/Destiny2/{membership_type}/Account/{destiny_membership_id}/Character/{character_id}/Stats/Activities/"
         
-        # Add query parameters
-        params = []
-        if mode is not None:
-            params.append(f"mode={mode}")
-        if page is not None:
-            params.append(f"page={page}")
-        if count is not None:
-            params.append(f"count={count}")
-            
-        # Add params to URL if any exist
-        if params:
-            url += "?" + "&".join(params)
-            
-        headers = {
-            "X-API-Key": BUNGIE_API_KEY
-        }
+        # aiohttp encodes the query string; None values are simply omitted
+        params = {"mode": mode, "page": page, "count": count}
+        params = {key: value for key, value in params.items() if value is not None}
         
-        # Create a new session for the request
-        activities_data = {}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                activities_response = await response.json()
-                if response.status == 200 and "Response" in activities_response:
-                    activities_data = activities_response.get("Response", {})
+        # Ride the shared keep-alive session; the API key is a default header
+        activities_data = await _bungie_get(url, params=params)
         
-        # Filter by date if specified
+        # Filter by date if specified. The period field is fixed-format
+        # ISO 8601, which sorts lexicographically, so the bounds are
+        # rendered to strings once and each row is a plain string compare
+        # instead of a strptime parse.
         if start_date or end_date:
+            start_str = start_date.strftime("%Y-%m-%dT%H:%M:%SZ") if start_date else ""
+            end_str = end_date.strftime("%Y-%m-%dT%H:%M:%SZ") if end_date else ""
             filtered_activities = []
             
-            if "activities" in activities_data:
-                for activity in activities_data.get("activities", []):
-                    # Get the activity date
+            if activities_data.get("activities"):
+                for activity in activities_data["activities"]:
                     period = activity.get("period", "")
                     if period:
-                        # Parse the date from the period string
-                        activity_date = datetime.strptime(period, "%Y-%m-%dT%H:%M:%SZ")
-                        
                         # Check if within date range
-                        if start_date and activity_date < start_date:
+                        if start_str and period < start_str:
                             continue
-                        if end_date and activity_date > end_date:
+                        if end_str and period > end_str:
                             continue
                             
                         # If we reach here, the activity is within the date range
@@ -509,8 +1213,9 @@ async def get_activity_history(
                 # Replace the activities with the filtered list
                 activities_data["activities"] = filtered_activities
         
-        # Transform the data for Tableau
-        tableau_data = transform_activities_for_tableau(activities_data)
+        # Transform the data for Tableau on a worker thread so a
+        # thousand-row page doesn't stall other in-flight requests
+        tableau_data = await asyncio.to_thread(transform_activities_for_tableau, activities_data)
         
         return {
             "status": "success",
@@ -520,11 +1225,11 @@ async def get_activity_history(
         }
     
     except BungieException as e:
-        logger.error(f"Bungie API error getting activity history: {e}")
+        logger.error("Bungie API error getting activity history: %s", e)
         return {"error": f"Bungie API error: {e}"}
     
     except Exception as e:
-        logger.error(f"Unexpected error getting activity history: {e}")
+        logger.error("Unexpected error getting activity history: %s", e)
         return {"error": f"Unexpected error: {e}"}
 
 
@@ -547,20 +1252,11 @@ async def get_aggregate_activity_stats(
     try:
         # Build the URL for aggregate stats request
         url = f"https://www.bungie.net/Platform/Destiny2/{membership_type}/Account/{destiny_membership_id}/Character/{character_id}/Stats/AggregateActivityStats/"
-        headers = {
-            "X-API-Key": BUNGIE_API_KEY
-        }
-        
-        # Create a new session for the request
-        aggregate_data = {}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                aggregate_response = await response.json()
-                if response.status == 200 and "Response" in aggregate_response:
-                    aggregate_data = aggregate_response.get("Response", {})
+        # Ride the shared keep-alive session; the API key is a default header
+        aggregate_data = await _bungie_get(url)
         
-        # Transform the data for Tableau
-        tableau_data = transform_aggregate_stats_for_tableau(aggregate_data)
+        # Transform the data for Tableau off the event loop
+        tableau_data = await asyncio.to_thread(transform_aggregate_stats_for_tableau, aggregate_data)
         
         return {
             "status": "success",
@@ -569,11 +1265,11 @@ async def get_aggregate_activity_stats(
         }
     
     except BungieException as e:
-        logger.error(f"Bungie API error getting aggregate stats: {e}")
+        logger.error("Bungie API error getting aggregate stats: %s", e)
         return {"error": f"Bungie API error: {e}"}
     
     except Exception as e:
-        logger.error(f"Unexpected error getting aggregate stats: {e}")
+        logger.error("Unexpected error getting aggregate stats: %s", e)
         return {"error": f"Unexpected error: {e}"}
 
 
@@ -607,48 +1303,28 @@ async def get_historical_stats_with_period(
         # Build the URL for historical stats request
         url = f"https://www.bungie.net/Platform/Destiny2/{membership_type}/Account/{destiny_membership_id}/Character/{character_id}/Stats/"
         
-        # Add query parameters
-        params = []
-        
-        # Add period type
+        # aiohttp encodes the query string; unset filters are omitted
+        params: Dict[str, Any] = {}
         if period_type:
-            params.append(f"periodType={period_type.value}")
-            
-        # Add modes if specified
+            params["periodType"] = period_type.value
         if modes:
-            modes_str = ",".join(str(m) for m in modes)
-            params.append(f"modes={modes_str}")
-            
-        # Add groups if specified
+            params["modes"] = ",".join(str(m) for m in modes)
         if groups:
-            groups_str = ",".join(str(g) for g in groups)
-            params.append(f"groups={groups_str}")
-            
-        # Add date range if period type is daily
-        if period_type == PeriodType.DAILY:
+            params["groups"] = ",".join(str(g) for g in groups)
+        
+        # Add date range if period type is daily; enum members are
+        # singletons, so identity is the right (and cheapest) compare
+        if period_type is PeriodType.DAILY:
             if start_date:
-                params.append(f"daystart={start_date.strftime('%Y-%m-%d')}")
+                params["daystart"] = start_date.strftime("%Y-%m-%d")
             if end_date:
-                params.append(f"dayend={end_date.strftime('%Y-%m-%d')}")
+                params["dayend"] = end_date.strftime("%Y-%m-%d")
         
-        # Add params to URL if any exist
-        if params:
-            url += "?" + "&".join(params)
-            
-        headers = {
-            "X-API-Key": BUNGIE_API_KEY
-        }
+        # Ride the shared keep-alive session; the API key is a default header
+        stats_data = await _bungie_get(url, params=params)
         
-        # Create a new session for the request
-        stats_data = {}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                stats_response = await response.json()
-                if response.status == 200 and "Response" in stats_response:
-                    stats_data = stats_response.get("Response", {})
-        
-        # Transform the data for Tableau
-        tableau_data = transform_historical_stats_for_tableau(stats_data, period_type)
+        # Transform the data for Tableau off the event loop
+        tableau_data = await asyncio.to_thread(transform_historical_stats_for_tableau, stats_data, period_type)
         
         return {
             "status": "success",
@@ -657,49 +1333,82 @@ async def get_historical_stats_with_period(
         }
     
     except BungieException as e:
-        logger.error(f"Bungie API error getting historical stats: {e}")
+        logger.error("Bungie API error getting historical stats: %s", e)
         return {"error": f"Bungie API error: {e}"}
     
     except Exception as e:
-        logger.error(f"Unexpected error getting historical stats: {e}")
+        logger.error("Unexpected error getting historical stats: %s", e)
         return {"error": f"Unexpected error: {e}"}
 
 
 # Data transformation functions for Tableau
 
-def transform_activities_for_tableau(activities_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+def transform_activities_for_tableau(activities_data: Dict[str, Any]) -> Dict[str, List[Any]]:
     """
-    Transform activity history data into a format suitable for Tableau.
+    Transform activity history data into columnar form for Tableau.
+    
+    One list per field instead of a fourteen-key dict per activity: the
+    key strings exist once per column rather than once per row, which is
+    both smaller to serialize and the layout Tableau ingests anyway.
     
     Args:
         activities_data: Activity history data from the Bungie API
         
     Returns:
-        List of dicts with flattened activity data for Tableau
+        Dict mapping column names to parallel value lists
     """
-    tableau_data = []
+    instance_ids: List[str] = []
+    dates: List[str] = []
+    hashes: List[int] = []
+    names: List[str] = []
+    modes: List[int] = []
+    mode_types: List[int] = []
+    privates: List[bool] = []
+    completed: List[Any] = []
+    times_played: List[Any] = []
+    kills: List[Any] = []
+    deaths: List[Any] = []
+    assists: List[Any] = []
+    scores: List[Any] = []
+    standings: List[Any] = []
     
     for activity in activities_data.get("activities", []):
-        # Basic activity info
-        activity_entry = {
-            "instanceId": activity.get("activityDetails", {}).get("instanceId", ""),
-            "activityDate": activity.get("period", ""),
-            "activityHash": activity.get("activityDetails", {}).get("referenceId", 0),
-            "activityName": activity.get("activityDetails", {}).get("displayProperties", {}).get("name", "Unknown Activity"),
-            "activityMode": activity.get("activityDetails", {}).get("mode", 0),
-            "activityModeType": activity.get("activityDetails", {}).get("modeType", 0),
-            "isPrivate": activity.get("activityDetails", {}).get("isPrivate", False),
-            "completed": activity.get("values", {}).get("completed", {}).get("basic", {}).get("value", 0),
-            "timePlayedSeconds": activity.get("values", {}).get("timePlayedSeconds", {}).get("basic", {}).get("value", 0),
-            "kills": activity.get("values", {}).get("kills", {}).get("basic", {}).get("value", 0),
-            "deaths": activity.get("values", {}).get("deaths", {}).get("basic", {}).get("value", 0),
-            "assists": activity.get("values", {}).get("assists", {}).get("basic", {}).get("value", 0),
-            "score": activity.get("values", {}).get("score", {}).get("basic", {}).get("value", 0),
-            "standing": activity.get("values", {}).get("standing", {}).get("basic", {}).get("value", 0)
-        }
-        tableau_data.append(activity_entry)
+        # Pull the two nested containers once per activity; the stat reads
+        # go through _basic, so the seven chained .get() calls (and their
+        # throwaway {} defaults) per field become a single try/except
+        details = activity.get("activityDetails") or {}
+        values = activity.get("values") or {}
+        instance_ids.append(details.get("instanceId", ""))
+        dates.append(activity.get("period", ""))
+        hashes.append(details.get("referenceId", 0))
+        names.append(details.get("displayProperties", {}).get("name", "Unknown Activity"))
+        modes.append(details.get("mode", 0))
+        mode_types.append(details.get("modeType", 0))
+        privates.append(details.get("isPrivate", False))
+        completed.append(_basic(values, "completed"))
+        times_played.append(_basic(values, "timePlayedSeconds"))
+        kills.append(_basic(values, "kills"))
+        deaths.append(_basic(values, "deaths"))
+        assists.append(_basic(values, "assists"))
+        scores.append(_basic(values, "score"))
+        standings.append(_basic(values, "standing"))
     
-    return tableau_data
+    return {
+        "instanceId": instance_ids,
+        "activityDate": dates,
+        "activityHash": hashes,
+        "activityName": names,
+        "activityMode": modes,
+        "activityModeType": mode_types,
+        "isPrivate": privates,
+        "completed": completed,
+        "timePlayedSeconds": times_played,
+        "kills": kills,
+        "deaths": deaths,
+        "assists": assists,
+        "score": scores,
+        "standing": standings
+    }
 
 
 def transform_aggregate_stats_for_tableau(aggregate_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -723,59 +1432,178 @@ def transform_aggregate_stats_for_tableau(aggregate_data: Dict[str, Any]) -> Lis
         # Add all values from the activity's values dictionary
         values = activity.get("values", {})
         for stat_name, stat_data in values.items():
-            if "basic" in stat_data:
-                stats_entry[stat_name] = stat_data["basic"].get("value", 0)
+            basic = stat_data.get("basic")
+            if basic is not None:
+                stats_entry[stat_name] = basic.get("value", 0)
         
         tableau_data.append(stats_entry)
     
     return tableau_data
 
 
-def transform_historical_stats_for_tableau(stats_data: Dict[str, Any], period_type: PeriodType) -> List[Dict[str, Any]]:
+# C-level accessors for the {"basic": {"value": v}} stat envelope; each
+# is a single call instead of a subscript-plus-bound-method pair
+_BASIC = operator.itemgetter("basic")
+_VALUE = operator.itemgetter("value")
+
+
+def _flatten_stat_values(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten {stat: {"basic": {"value": v}}} to {stat: v} in one pass.
+    The itemgetter chain runs the two lookups in C, and the try costs
+    nothing on the happy path - a malformed stat (missing envelope) is
+    simply skipped, as before. Stat names are interned: only ~50
+    distinct names recur across every day and mode, so each output dict
+    holds the one canonical string (cached hash, identity compare on
+    lookup) rather than a fresh copy per row.
+    """
+    intern = sys.intern
+    flattened: Dict[str, Any] = {}
+    for name, stat_data in stats.items():
+        try:
+            flattened[intern(name)] = _VALUE(_BASIC(stat_data))
+        except (KeyError, TypeError):
+            continue
+    return flattened
+
+
+def _historical_rows_daily(stats_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
     """
-    Transform historical stats data into a format suitable for Tableau.
+    Yield one flattened row per mode per day.
+    
+    The days of a mode share the same ~50 stat names, so the first day
+    seeds a key template and later rows start as template.copy() -
+    dict.copy preserves the hash-table layout, so overwriting existing
+    keys never triggers a resize. A stat that only appears on later days
+    still inserts normally; it is just not pre-sized.
+    """
+    intern = sys.intern
+    for mode_key, mode_data in stats_data.items():
+        mode_key = intern(mode_key)
+        template: Optional[Dict[str, Any]] = None
+        for day, day_stats in mode_data.get("daily", {}).items():
+            values = day_stats.get("values", {})
+            if template is None:
+                template = {"date": "", "mode": mode_key}
+                for name in values:
+                    template[intern(name)] = 0
+            row = template.copy()
+            row["date"] = day
+            row["mode"] = mode_key
+            for name, stat_data in values.items():
+                try:
+                    row[intern(name)] = _VALUE(_BASIC(stat_data))
+                except (KeyError, TypeError):
+                    continue
+            yield row
+
+
+def _historical_rows_all_time(stats_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield one flattened row per mode from the allTime rollup."""
+    for mode_key, mode_data in stats_data.items():
+        all_time = mode_data.get("allTime")
+        if all_time:
+            yield {
+                "mode": mode_key,
+                **_flatten_stat_values(all_time)
+            }
+
+
+# Period-type dispatch: the branch is resolved once per call here instead
+# of being re-tested inside the transform, and each builder keeps its own
+# tight loop. Every non-daily period uses the allTime rollup.
+_HISTORICAL_ROW_BUILDERS = {
+    PeriodType.DAILY: _historical_rows_daily,
+}
+
+
+def transform_historical_stats_for_tableau(stats_data: Dict[str, Any], period_type: PeriodType) -> Dict[str, List[Any]]:
+    """
+    Transform historical stats data into columnar form for Tableau.
     
     Args:
         stats_data: Historical stats data from the Bungie API
         period_type: The period type of the stats (daily, all time, etc.)
         
     Returns:
-        List of dicts with flattened stats data for Tableau
+        Dict mapping column names to parallel value lists
     """
-    tableau_data = []
+    builder = _HISTORICAL_ROW_BUILDERS.get(period_type, _historical_rows_all_time)
     
-    # Handle different period types differently
-    if period_type == PeriodType.DAILY:
-        # For daily stats, create an entry for each day
-        for mode_key, mode_data in stats_data.items():
-            for day, day_stats in mode_data.get("daily", {}).items():
-                entry = {
-                    "date": day,
-                    "mode": mode_key
-                }
-                
-                # Add all stat values for this day
-                for stat_name, stat_data in day_stats.get("values", {}).items():
-                    if "basic" in stat_data:
-                        entry[stat_name] = stat_data["basic"].get("value", 0)
-                
-                tableau_data.append(entry)
-    else:
-        # For all time or other period types, create a single entry per mode
-        for mode_key, mode_data in stats_data.items():
-            if "allTime" in mode_data:
-                entry = {
-                    "mode": mode_key
-                }
-                
-                # Add all stat values for this mode
-                for stat_name, stat_data in mode_data["allTime"].items():
-                    if "basic" in stat_data:
-                        entry[stat_name] = stat_data["basic"].get("value", 0)
-                
-                tableau_data.append(entry)
+    # Transpose to one list per column, like the activity and weapon
+    # transforms: key strings are stored once per column instead of once
+    # per row. The builders are generators, so each row dict is consumed
+    # into the columns as it is produced and only the columnar result is
+    # ever resident. Stat names can differ between modes, so columns are
+    # opened on first sight and padded where a mode lacks a stat (empty
+    # string for the label columns, zero for stats).
+    columns: Dict[str, List[Any]] = {}
+    row_count = 0
+    for row in builder(stats_data):
+        for name, value in row.items():
+            column = columns.get(name)
+            if column is None:
+                # Back-fill the rows that predate this column
+                pad = "" if name in ("date", "mode") else 0
+                column = columns[name] = [pad] * row_count
+            column.append(value)
+        row_count += 1
+        for name, column in columns.items():
+            if len(column) < row_count:
+                column.append("" if name in ("date", "mode") else 0)
+    return columns
+
+
+def aggregate_stats_by_mode(columns: Dict[str, List[Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Reduce columnar historical stats to per-mode totals.
     
-    return tableau_data
+    Takes the dict-of-lists output of transform_historical_stats_for_tableau
+    and sums every numeric column grouped by mode. Mode strings are
+    factorized to small int codes once up front so each column reduces
+    with plain integer indexing into a flat array("d") accumulator
+    instead of hashing the mode string per row.
+    
+    Args:
+        columns: Dict mapping column names to parallel value lists
+        
+    Returns:
+        Dict mapping each mode to {stat_name: total}
+    """
+    modes = columns.get("mode")
+    if not modes:
+        return {}
+    
+    # Factorize: one dict lookup per row here buys index-only access in
+    # every column reduction below
+    code_for: Dict[str, int] = {}
+    codes = array("i")
+    for mode in modes:
+        code = code_for.get(mode)
+        if code is None:
+            code = code_for[mode] = len(code_for)
+        codes.append(code)
+    
+    n_modes = len(code_for)
+    totals: Dict[str, Dict[str, float]] = {mode: {} for mode in code_for}
+    mode_names = list(code_for)
+    
+    for name, values in columns.items():
+        if name in ("date", "mode"):
+            continue
+        sums = array("d", bytes(8 * n_modes))
+        try:
+            for i, value in enumerate(values):
+                sums[codes[i]] += value
+        except TypeError:
+            # Non-numeric stat column (shouldn't happen after
+            # _flatten_stat_values, but don't let one bad column
+            # poison the whole reduction)
+            continue
+        for mode_index, mode in enumerate(mode_names):
+            totals[mode][name] = sums[mode_index]
+    
+    return totals
 
 
 async def main():
@@ -783,14 +1611,25 @@ async def main():
     Main function to test the API client
     """
     print("Testing Bungie API connection...")
-    # Test the API connection
-    connection_test = await test_api_connection()
+    try:
+        await _run_tests()
+    finally:
+        await close_session()
+
+
+async def _run_tests():
+    """Exercise the API client end to end against the live Bungie API."""
+    # The connection probe and the manifest fetch are independent, so
+    # overlap their round trips
+    connection_test, inventory_items = await asyncio.gather(
+        test_api_connection(),
+        get_manifest_component("DestinyInventoryItemDefinition"),
+    )
     print(f"Connection test result: {connection_test}")
 
     # Test the manifest component retrieval
     print("\nTesting manifest component retrieval...")
-    inventory_items = await get_manifest_component("DestinyInventoryItemDefinition")
-    if "status" in inventory_items and inventory_items["status"] == "success":
+    if inventory_items.get("status") == "success":
         component_data = inventory_items.get("componentData", {})
         print(f"Successfully retrieved inventory item definitions with {len(component_data)} entries")
         
@@ -814,81 +1653,107 @@ async def main():
         
         print(f"\nAttempting to fetch profile for {bungie_name}#{bungie_code}...")
         
-        profile = await get_user_profile(bungie_name, bungie_code)
-        if "error" in profile:
-            print(f"Error: {profile['error']}")
+        # Resolve the membership first so the dependent requests can overlap
+        membership = await _search_player(bungie_name, bungie_code)
+        if membership is None:
+            print("Error: User not found")
         else:
+            membership_type = membership.get("membershipType")
+            membership_id = membership.get("membershipId")
+            
+            # Profile components and account stats only depend on the
+            # membership, so issue them concurrently. The weapon fetch
+            # needs a character id, so it is started inside the group the
+            # moment the profile resolves - overlapping it with the stats
+            # request instead of waiting for both to be printed. TaskGroup
+            # cancels the surviving siblings as soon as any task fails.
+            print(f"\nFetching profile and stats for membership ID: {membership_id}...")
+            first_char_id = None
+            weapon_task = None
+            async with asyncio.TaskGroup() as tg:
+                stats_task = tg.create_task(get_player_stats(membership_type, membership_id))
+                response_data = await tg.create_task(fetch_profile_components(membership))
+                characters = response_data.get("characters", {}).get("data") or {}
+                if characters:
+                    first_char_id = next(iter(characters))
+                    weapon_task = tg.create_task(get_weapon_usage_stats(
+                        membership_type,
+                        membership_id,
+                        first_char_id
+                    ))
+            stats = stats_task.result()
+            
             print(f"Successfully retrieved profile!")
-            # Print some basic information
-            if "profile" in profile:
-                response_data = profile["profile"]
-                if "characters" in response_data and "data" in response_data["characters"]:
-                    characters = response_data["characters"]["data"]
-                    print(f"Found {len(characters)} characters")
-                    
-                    # Get character details
-                    for char_id, char_data in characters.items():
-                        char_class = char_data.get("classType", "Unknown")
-                        char_light = char_data.get("light", 0)
-                        char_race = char_data.get("raceType", "Unknown")
-                        print(f"Character: {char_id} - Class: {char_class}, Light: {char_light}, Race: {char_race}")
+            if characters:
+                print(f"Found {len(characters)} characters")
+                
+                # Get character details - one write (and one stdout
+                # lock/flush) for the whole block instead of one per line
+                lines = []
+                for char_id, char_data in characters.items():
+                    char_class = char_data.get("classType", "Unknown")
+                    char_light = char_data.get("light", 0)
+                    char_race = char_data.get("raceType", "Unknown")
+                    lines.append(f"Character: {char_id} - Class: {char_class}, Light: {char_light}, Race: {char_race}")
+                print("\n".join(lines))
+            
+            if "error" not in stats:
+                print("Successfully retrieved stats!")
                 
-                # If we have membership data, attempt to get stats as well
-                if "membership" in profile:
-                    membership_type = profile["membership"].get("membershipType")
-                    membership_id = profile["membership"].get("membershipId")
+                # Print some basic PvE stats if available
+                pve_stats = stats.get("allPvE", {}).get("allTime", {})
+                if pve_stats:
+                    cleared = pve_stats.get("activitiesCleared")
+                    if cleared is not None:
+                        print(f"PvE Activities Cleared: {cleared['basic']['value']}")
+                    pve_kills = pve_stats.get("kills")
+                    if pve_kills is not None:
+                        print(f"PvE Kills: {pve_kills['basic']['value']}")
+            else:
+                print(f"Error fetching stats: {stats.get('error')}")
+
+            # Weapon usage for the first character, fetched above in
+            # parallel with the stats
+            if weapon_task is not None:
+                print(f"\nWeapon usage stats for character: {first_char_id}...")
+                weapon_stats = weapon_task.result()
+                
+                if "error" not in weapon_stats:
+                    print("Successfully retrieved weapon stats!")
+                    print(f"Total weapons: {weapon_stats.get('totalWeapons', 0)}")
                     
-                    if membership_type and membership_id:
-                        print(f"\nFetching stats for membership ID: {membership_id}...")
-                        stats = await get_player_stats(membership_type, membership_id)
-                        
-                        if "error" not in stats:
-                            print("Successfully retrieved stats!")
-                            
-                            # Print some basic PvE stats if available
-                            if "allPvE" in stats and "allTime" in stats["allPvE"]:
-                                pve_stats = stats["allPvE"]["allTime"]
-                                if "activitiesCleared" in pve_stats:
-                                    activities = pve_stats["activitiesCleared"]["basic"]["value"]
-                                    print(f"PvE Activities Cleared: {activities}")
-                                if "kills" in pve_stats:
-                                    kills = pve_stats["kills"]["basic"]["value"]
-                                    print(f"PvE Kills: {kills}")
-                        else:
-                            print(f"Error fetching stats: {stats.get('error')}")
-
-                    # Now let's get weapon usage for the first character if any characters are found
-                    if "characters" in response_data and "data" in response_data["characters"]:
-                        characters = response_data["characters"]["data"]
-                        if characters:
-                            first_char_id = next(iter(characters))
-                            print(f"\nFetching weapon usage stats for character: {first_char_id}...")
-                            
-                            weapon_stats = await get_weapon_usage_stats(
-                                membership_type, 
-                                membership_id, 
-                                first_char_id
-                            )
-                            
-                            if "error" not in weapon_stats:
-                                print("Successfully retrieved weapon stats!")
-                                print(f"Total weapons: {weapon_stats.get('totalWeapons', 0)}")
-                                
-                                # Print top 5 weapons by kill count
-                                weapons = sorted(
-                                    weapon_stats.get("weaponStats", []), 
-                                    key=lambda w: w.get("killCount", 0), 
-                                    reverse=True
-                                )[:5]
-                                
-                                print("\nTop 5 weapons by kill count:")
-                                for idx, weapon in enumerate(weapons, 1):
-                                    print(f"{idx}. {weapon.get('weaponName', 'Unknown')} - Kills: {weapon.get('killCount', 0)}, Precision: {weapon.get('precisionKillCount', 0)}")
-                            else:
-                                print(f"Error fetching weapon stats: {weapon_stats.get('error')}")
+                    # Print top 5 weapons by kill count
+                    columns = weapon_stats.get("columns", {})
+                    kill_counts = columns.get("killCount", [])
+                    # nlargest is O(N log 5) versus a full O(N log N) sort
+                    top = heapq.nlargest(
+                        5,
+                        range(len(kill_counts)),
+                        key=kill_counts.__getitem__
+                    )
+                    
+                    weapon_names = columns.get("weaponName", [])
+                    precision_counts = columns.get("precisionKillCount", [])
+                    lines = ["\nTop 5 weapons by kill count:"]
+                    for idx, row in enumerate(top, 1):
+                        lines.append(f"{idx}. {weapon_names[row]} - Kills: {kill_counts[row]}, Precision: {precision_counts[row]}")
+                    print("\n".join(lines))
+                else:
+                    print(f"Error fetching weapon stats: {weapon_stats.get('error')}")
 
 
 # Run the main function if this script is executed directly
 if __name__ == "__main__":
+    # uvloop is a drop-in faster event loop; the selector default is used
+    # when it isn't installed (e.g. on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     asyncio.run(main())
 
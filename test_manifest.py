@@ -5,8 +5,7 @@ This script demonstrates how to fetch and use the Destiny 2 Manifest data
 through the get_manifest_component function.
 """
 import asyncio
-import json
-from python_api.destiny_api import get_manifest_component
+from python_api.destiny_api import get_manifest_component, close_session
 
 async def test_inventory_items():
     """Test retrieving inventory item definitions from the manifest"""
@@ -21,17 +20,23 @@ async def test_inventory_items():
         if component_data:
             sample_hash = next(iter(component_data))
             sample_item = component_data[sample_hash]
-            print("\nSample Item Details:")
-            print(f"Hash: {sample_hash}")
-            print(f"Name: {sample_item.get('displayProperties', {}).get('name', 'Unknown')}")
-            print(f"Type: {sample_item.get('itemTypeDisplayName', 'Unknown')}")
-            print(f"Tier: {sample_item.get('inventory', {}).get('tierTypeName', 'Unknown')}")
-            print(f"Description: {sample_item.get('displayProperties', {}).get('description', 'No description')}")
+            # One displayProperties lookup serves all four reads below
+            display = sample_item.get('displayProperties') or {}
+            lines = [
+                "\nSample Item Details:",
+                f"Hash: {sample_hash}",
+                f"Name: {display.get('name', 'Unknown')}",
+                f"Type: {sample_item.get('itemTypeDisplayName', 'Unknown')}",
+                f"Tier: {sample_item.get('inventory', {}).get('tierTypeName', 'Unknown')}",
+                f"Description: {display.get('description', 'No description')}",
+            ]
             
             # Check if it has an icon
-            icon = sample_item.get('displayProperties', {}).get('icon', '')
+            icon = display.get('icon', '')
             if icon:
-                print(f"Icon URL: https://www.bungie.net{icon}")
+                lines.append(f"Icon URL: https://www.bungie.net{icon}")
+            # A single print takes the stdout lock and flushes once
+            print("\n".join(lines))
             
             return True
     else:
@@ -51,11 +56,14 @@ async def test_activity_definitions():
         if component_data:
             sample_hash = next(iter(component_data))
             sample_activity = component_data[sample_hash]
-            print("\nSample Activity Details:")
-            print(f"Hash: {sample_hash}")
-            print(f"Name: {sample_activity.get('displayProperties', {}).get('name', 'Unknown')}")
-            print(f"Description: {sample_activity.get('displayProperties', {}).get('description', 'No description')}")
-            print(f"Activity Type: {sample_activity.get('activityTypeHash', 'Unknown')}")
+            display = sample_activity.get('displayProperties') or {}
+            print("\n".join([
+                "\nSample Activity Details:",
+                f"Hash: {sample_hash}",
+                f"Name: {display.get('name', 'Unknown')}",
+                f"Description: {display.get('description', 'No description')}",
+                f"Activity Type: {sample_activity.get('activityTypeHash', 'Unknown')}",
+            ]))
             
             return True
     else:
@@ -67,11 +75,16 @@ async def main():
     print("Testing Destiny 2 Manifest Component Retrieval")
     print("=============================================\n")
     
-    # Test inventory items
-    items_success = await test_inventory_items()
-    
-    # Test activity definitions
-    activities_success = await test_activity_definitions()
+    try:
+        # Test inventory items
+        items_success = await test_inventory_items()
+        
+        # Test activity definitions
+        activities_success = await test_activity_definitions()
+    finally:
+        # The fetches ride the module's shared session; close it so the
+        # run doesn't end with unclosed-session warnings
+        await close_session()
     
     # Summary
     print("\nTest Summary:")
@@ -7,8 +7,9 @@ import asyncio
 import sys
 import os
 
-# Import the get_manifest_component function from our standalone helper
-from manifest_helper import get_manifest_component
+# Import the summary helper - this test only needs the entry count and
+# one sample item, so the full definitions dict is never built
+from manifest_helper import get_manifest_component_summary, close_session
 
 async def test_manifest_component():
     """Test basic manifest component retrieval"""
@@ -16,19 +17,22 @@ async def test_manifest_component():
     print("=============================================\n")
     
     print("Retrieving Destiny Inventory Item Definitions...")
-    result = await get_manifest_component("DestinyInventoryItemDefinition")
+    try:
+        result = await get_manifest_component_summary("DestinyInventoryItemDefinition")
+    finally:
+        # Close the helper's shared session so the run doesn't end with
+        # unclosed-session warnings
+        await close_session()
     
     if result.get("status") == "success":
-        component_data = result.get("componentData", {})
-        count = len(component_data)
+        count = result.get("count", 0)
         print(f"Success! Retrieved {count} inventory item definitions")
         
-        # Display a sample item if we have data
-        if count > 0:
-            sample_hash = next(iter(component_data))
-            sample_item = component_data[sample_hash]
+        # Display the sample item if we have data
+        sample_item = result.get("sample")
+        if count > 0 and sample_item is not None:
             print("\nSample Item:")
-            print(f"Hash: {sample_hash}")
+            print(f"Hash: {result.get('sampleHash')}")
             name = sample_item.get('displayProperties', {}).get('name', 'Unknown')
             print(f"Name: {name}")
             item_type = sample_item.get('itemTypeDisplayName', 'Unknown')